@@ -0,0 +1,249 @@
+import argparse
+import gc
+import json
+import logging
+import math
+from pathlib import Path
+import statistics
+import time
+from typing import Dict, List
+
+from solver import Solver, get_day_solver
+from utils.answer_cache import _to_json
+
+
+def _percentile(samples: List[int], pct: float) -> float:
+    """Nearest-rank percentile, which is plenty for the sample sizes we use"""
+    ordered = sorted(samples)
+    rank = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {number}")
+    return number
+
+
+def summarise(samples_ns: List[int]) -> Dict:
+    return {
+        "min_ns": min(samples_ns),
+        "median_ns": statistics.median(samples_ns),
+        "p95_ns": _percentile(samples_ns, 95),
+        "mean_ns": statistics.mean(samples_ns),
+        "stddev_ns": statistics.stdev(samples_ns) if len(samples_ns) > 1 else 0.0,
+    }
+
+
+def bench_part(day: int, part: int, use_sample: bool, runs: int, warmup: int) -> Dict:
+    """Each sample gets a fresh solver so no state (or cached artifacts) leak
+    between runs
+    """
+    day_class = get_day_solver(day)
+    samples_ns = []
+    phase_samples_ns = {}
+    peak_memory = {}
+    memo_stats = {}
+    for run_idx in range(warmup + runs):
+        day_solver = day_class(day, use_sample, [part == 1, part == 2])
+
+        gc.collect()
+        part_result = day_solver._solve(getattr(day_solver, f"part{part}"), part, use_sample)
+        if run_idx >= warmup:
+            samples_ns.append(part_result["time_ns"])
+            for name, phase_ns in part_result["phases_ns"].items():
+                phase_samples_ns.setdefault(name, []).append(phase_ns)
+            for key in ["peak_rss_kib", "peak_traced_kib"]:
+                if key in part_result:
+                    peak_memory[key] = max(peak_memory.get(key, 0), part_result[key])
+            if "memo_stats" in part_result:
+                memo_stats = {"memo_stats": part_result["memo_stats"]}  # The same every run
+
+    return {
+        "day": day,
+        "part": part,
+        "answer": part_result["answer"],
+        "samples_ns": samples_ns,
+        **summarise(samples_ns),
+        "phases_median_ns": {k: statistics.median(v) for k, v in phase_samples_ns.items()},
+        **peak_memory,
+        **memo_stats,
+    }
+
+
+def _mann_whitney_p(baseline: List[int], candidate: List[int]) -> float:
+    """One-sided p-value that the candidate samples tend to be larger (slower)
+    than the baseline, using the normal approximation to the Mann-Whitney U
+    test. Rank based, so a couple of noisy outliers do not swamp the result.
+    """
+    ranked = sorted([(x, 0) for x in baseline] + [(x, 1) for x in candidate])
+
+    ranks = [0.0] * len(ranked)
+    idx = 0
+    while idx < len(ranked):
+        tie_end = idx
+        while tie_end + 1 < len(ranked) and ranked[tie_end + 1][0] == ranked[idx][0]:
+            tie_end += 1
+        for tie_idx in range(idx, tie_end + 1):
+            ranks[tie_idx] = (idx + tie_end) / 2 + 1
+        idx = tie_end + 1
+
+    n1, n2 = len(baseline), len(candidate)
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, ranked) if group == 1)
+    u_stat = rank_sum - n2 * (n2 + 1) / 2
+    u_std = math.sqrt(n1 * n2 * (n1 + n2 + 1) / 12)
+    if u_std == 0:
+        return 1.0
+
+    z_score = (u_stat - n1 * n2 / 2 - 0.5) / u_std
+    return 1 - statistics.NormalDist().cdf(z_score)
+
+
+def compare(baseline: Dict, candidate: Dict, alpha: float, threshold: float) -> List[Dict]:
+    """Match up each day/part in both files and flag a change when it is both
+    statistically significant and bigger than the threshold (as a fraction of
+    the baseline median).
+    """
+    baseline_lookup = {(x["day"], x["part"]): x for x in baseline["results"]}
+
+    comparisons = []
+    for result in candidate["results"]:
+        key = (result["day"], result["part"])
+        if key not in baseline_lookup:
+            continue
+        base_result = baseline_lookup[key]
+
+        ratio = result["median_ns"] / base_result["median_ns"]
+        p_slower = _mann_whitney_p(base_result["samples_ns"], result["samples_ns"])
+        p_faster = _mann_whitney_p(result["samples_ns"], base_result["samples_ns"])
+
+        verdict = "~"
+        if p_slower < alpha and ratio > 1 + threshold:
+            verdict = "SLOWER"
+        elif p_faster < alpha and ratio < 1 - threshold:
+            verdict = "FASTER"
+
+        comparisons.append(
+            {
+                "day": result["day"],
+                "part": result["part"],
+                "baseline_median_ns": base_result["median_ns"],
+                "candidate_median_ns": result["median_ns"],
+                "ratio": ratio,
+                "p_value": min(p_slower, p_faster),
+                "verdict": verdict,
+            }
+        )
+    return comparisons
+
+
+def print_results(results: List[Dict]) -> None:
+    print(
+        f"{'day':>4} {'part':>4} {'min':>12} {'median':>12} {'p95':>12} {'stddev':>12}"
+        "  median by phase (ms)"
+    )
+    for result in results:
+        timings = [result[x] / 1e6 for x in ["min_ns", "median_ns", "p95_ns", "stddev_ns"]]
+        phases = " / ".join(f"{k} {v / 1e6:0.3f}" for k, v in result["phases_median_ns"].items())
+        memory = ""
+        if "peak_rss_kib" in result:
+            memory = (
+                f"  (peak RSS {result['peak_rss_kib'] / 1024:0.1f} MiB,"
+                f" traced {result['peak_traced_kib'] / 1024:0.1f} MiB)"
+            )
+        memo = ""
+        for name, stats in result.get("memo_stats", {}).items():
+            memo += (
+                f"  ({name}: {stats['hits']} hits, {stats['misses']} misses,"
+                f" {stats['size']} kept, {stats['evictions']} evicted)"
+            )
+        print(
+            f"{result['day']:>4} {result['part']:>4} "
+            + " ".join(f"{x:>12.3f}" for x in timings)
+            + f"  {phases}{memory}{memo}"
+        )
+
+
+def print_comparisons(comparisons: List[Dict]) -> None:
+    print(f"{'day':>4} {'part':>4} {'baseline':>12} {'candidate':>12} {'ratio':>7} {'p':>7}  (ms)")
+    for cmp in comparisons:
+        print(
+            f"{cmp['day']:>4} {cmp['part']:>4} {cmp['baseline_median_ns'] / 1e6:>12.3f}"
+            f" {cmp['candidate_median_ns'] / 1e6:>12.3f} {cmp['ratio']:>7.3f}"
+            f" {cmp['p_value']:>7.4f}  {cmp['verdict']}"
+        )
+
+
+def main() -> None:
+    args = argparse.ArgumentParser(description="Repeatable timings for each day/part")
+    subparsers = args.add_subparsers(dest="command", required=True)
+
+    run_args = subparsers.add_parser("run", help="Benchmark the selected days")
+    run_args.add_argument("days", type=int, nargs="*", help="Days to run (integers)")
+    run_args.add_argument("-s", action="store_true", help="Run with sample input")
+    run_args.add_argument("-a", action="store_true", help="Run all days")
+    run_args.add_argument("-o1", action="store_true", help="Only run part 1")
+    run_args.add_argument("-o2", action="store_true", help="Only run part 2")
+    run_args.add_argument("-n", "--runs", type=_positive_int, default=10, help="Timed runs per part")
+    run_args.add_argument("-w", "--warmup", type=int, default=2, help="Untimed runs per part")
+    run_args.add_argument("--output", type=Path, default=Path("bench_results.json"))
+    run_args.add_argument(
+        "--memory", action="store_true", help="Also record peak memory (timings will be slower)"
+    )
+
+    compare_args = subparsers.add_parser("compare", help="Diff two benchmark result files")
+    compare_args.add_argument("baseline", type=Path)
+    compare_args.add_argument("candidate", type=Path)
+    compare_args.add_argument("--alpha", type=float, default=0.05, help="Significance level")
+    compare_args.add_argument(
+        "--threshold", type=float, default=0.05, help="Ignore median changes smaller than this"
+    )
+
+    opts = args.parse_args()
+
+    if opts.command == "compare":
+        with open(opts.baseline, "r") as f:
+            baseline = json.load(f)
+        with open(opts.candidate, "r") as f:
+            candidate = json.load(f)
+        comparisons = compare(baseline, candidate, opts.alpha, opts.threshold)
+        print_comparisons(comparisons)
+        if any(x["verdict"] == "SLOWER" for x in comparisons):
+            raise SystemExit(1)
+        return
+
+    logging.getLogger("solver").setLevel(logging.WARNING)
+    Solver.track_memory = opts.memory
+
+    parts = [part for part, only in [(1, opts.o1), (2, opts.o2)] if only] or [1, 2]
+    days = range(1, 26) if opts.a else opts.days
+
+    results = []
+    for day in days:
+        try:
+            get_day_solver(day)
+        except ImportError:
+            print(f"!!! DAY {day:02d} NOT IMPLEMENTED YET !!!")
+            continue
+        for part in parts:
+            try:
+                results.append(bench_part(day, part, opts.s, opts.runs, opts.warmup))
+            except Exception as e:
+                print(f"!!! DAY {day:02d} PART {part} FAILED: {e!r} !!!")
+
+    print_results(results)
+    with open(opts.output, "w") as f:
+        bench_output = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "use_sample": opts.s,
+            "runs": opts.runs,
+            "warmup": opts.warmup,
+            "memory": opts.memory,
+            "results": results,
+        }
+        json.dump(bench_output, f, indent=2, default=_to_json)
+
+
+if __name__ == "__main__":
+    main()
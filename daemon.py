@@ -0,0 +1,255 @@
+import argparse
+import json
+import logging
+from pathlib import Path
+import socket
+import socketserver
+import sys
+import threading
+from typing import Dict, Iterator, List, Optional
+
+from solver import Solver, get_day_solver
+from utils.answer_cache import _to_json
+from utils.data_loader import DataLoader, TextDataLoader
+
+DEFAULT_SOCKET = Path(__file__).parent / ".solver.sock"
+MAX_HOT_INPUTS = 16  # Per day, before its loaded inputs and parses are dropped
+WARM_MODULES = ["numpy"]
+
+_LOG = logging.getLogger("solver.daemon")
+
+
+class SolverDaemon:
+    """Keeps one solver per day (and one for its sample) alive between
+    requests, so the modules, the loaded inputs and anything shared through
+    cache_parse/@artifact stay hot.
+    Requests are JSON objects:
+
+        {"day": 5, "part": 2, "input_path": "/abs/path.txt"}
+        {"day": 5, "part": 2, "input_text": "seeds: 79 14 55 13\\n..."}
+        {"day": 5, "part": 2, "sample": true}  # The day's own sample/input file
+
+    and the response is the part result from Solver._solve (answer, time_ns,
+    phases_ns, ...) with "ok": true, or "ok": false and an "error".
+    """
+
+    def __init__(self) -> None:
+        self.solvers = {}
+        self.lock = threading.Lock()  # Solvers are not thread safe (and the work is CPU bound)
+
+    def warm_up(self, days: List[int]) -> None:
+        """Import every day up front, and load the heavy packages that the
+        days only import lazily
+        """
+        for day in days:
+            try:
+                get_day_solver(day)
+            except ImportError:
+                continue
+
+        for module_name in WARM_MODULES:
+            module = sys.modules.get(module_name)
+            if module is not None:
+                getattr(module, "__dict__")  # Any attribute access finishes a lazy import
+
+    def __get_solver(self, day: int, use_sample: bool) -> Solver:
+        """Sample runs get their own solver, as some days behave differently
+        on the sample (e.g. a smaller area to search)
+        """
+        day_solver = self.solvers.get((day, use_sample))
+        if day_solver is None or len(day_solver._loaded_inputs) >= MAX_HOT_INPUTS:
+            day_solver = get_day_solver(day)(day, use_sample, [True, True])
+            self.solvers[(day, use_sample)] = day_solver
+        return day_solver
+
+    def solve(self, request: Dict) -> Dict:
+        day, part = int(request["day"]), int(request["part"])
+        if part not in [1, 2]:
+            raise ValueError(f"Part must be 1 or 2, not {part}")
+
+        data_loader = None
+        if "input_text" in request:
+            data_loader = TextDataLoader(request["input_text"])
+        elif "input_path" in request:
+            data_loader = DataLoader(Path(request["input_path"]))
+
+        use_sample = bool(request.get("sample", False))
+        with self.lock:
+            day_solver = self.__get_solver(day, use_sample)
+            part_solver = getattr(day_solver, f"part{part}")
+            return day_solver._solve(part_solver, part, use_sample, data_loader)
+
+    def handle(self, request: Dict) -> Dict:
+        try:
+            return {"ok": True, **self.solve(request)}
+        except Exception as e:
+            return {
+                "ok": False,
+                "error": repr(e),
+                "day": request.get("day"),
+                "part": request.get("part"),
+            }
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """One JSON request per line, one JSON response per line. Connections can
+    be kept open for as many requests as the client likes.
+    """
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                response = {"ok": False, "error": f"Bad request: {e}"}
+            else:
+                if request.get("command") == "shutdown":
+                    self.wfile.write(b'{"ok": true}\n')
+                    threading.Thread(target=self.server.shutdown).start()
+                    return
+                response = self.server.solver_daemon.handle(request)
+
+            self.wfile.write(json.dumps(response, default=_to_json).encode() + b"\n")
+            self.wfile.flush()
+
+
+class _Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, solver_daemon: SolverDaemon) -> None:
+        self.solver_daemon = solver_daemon
+        super().__init__(str(socket_path), _RequestHandler)
+
+
+def serve(socket_path: Path, days: List[int]) -> None:
+    socket_path = Path(socket_path)
+    if socket_path.exists():
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(str(socket_path))
+            raise RuntimeError(f"A daemon is already listening on {socket_path}")
+        except ConnectionRefusedError:
+            socket_path.unlink()  # Left behind by a daemon that did not shut down cleanly
+
+    solver_daemon = SolverDaemon()
+    solver_daemon.warm_up(days)
+
+    # Logging every part would cost more than solving most of them
+    logging.getLogger("solver").setLevel(logging.WARNING)
+    _LOG.warning(f"| Daemon listening on {socket_path} |")
+    try:
+        with _Server(socket_path, solver_daemon) as server:
+            server.serve_forever()
+    finally:
+        socket_path.unlink(missing_ok=True)
+
+
+class DaemonClient:
+    """Thin client that keeps a single connection open, e.g.
+
+    with DaemonClient() as client:
+        result = client.solve(5, 2, input_text=text)
+    """
+
+    def __init__(self, socket_path: Path = DEFAULT_SOCKET) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(str(socket_path))
+        self.stream = self.sock.makefile("rwb")
+
+    def __enter__(self) -> "DaemonClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.stream.close()
+        self.sock.close()
+
+    def request(self, request: Dict) -> Dict:
+        self.stream.write(json.dumps(request).encode() + b"\n")
+        self.stream.flush()
+        response = self.stream.readline()
+        if not response:
+            raise ConnectionError("The daemon closed the connection")
+        return json.loads(response)
+
+    def solve(
+        self,
+        day: int,
+        part: int,
+        input_path: Optional[Path] = None,
+        input_text: Optional[str] = None,
+        sample: bool = False,
+    ) -> Dict:
+        request = {"day": day, "part": part, "sample": sample}
+        if input_text is not None:
+            request["input_text"] = input_text
+        elif input_path is not None:
+            # The daemon may well be running from another directory
+            request["input_path"] = str(Path(input_path).resolve())
+        return self.request(request)
+
+    def shutdown(self) -> None:
+        self.request({"command": "shutdown"})
+
+
+def _iter_requests(opts: argparse.Namespace) -> Iterator[Dict]:
+    parts = [part for part, only in [(1, opts.o1), (2, opts.o2)] if only] or [1, 2]
+    input_text = sys.stdin.read() if opts.stdin else None
+    for day in opts.days:
+        for part in parts:
+            yield {
+                "day": day,
+                "part": part,
+                "input_path": opts.input,
+                "input_text": input_text,
+                "sample": opts.s,
+            }
+
+
+def main() -> None:
+    args = argparse.ArgumentParser(description="Long lived solver, to skip start up costs")
+    args.add_argument("--socket", type=Path, default=DEFAULT_SOCKET, help="Unix socket to use")
+    subparsers = args.add_subparsers(dest="command", required=True)
+
+    serve_args = subparsers.add_parser("serve", help="Start the daemon (in the foreground)")
+    serve_args.add_argument(
+        "days", type=int, nargs="*", default=list(range(1, 26)), help="Days to import up front"
+    )
+
+    solve_args = subparsers.add_parser("solve", help="Ask the daemon for answers (JSON lines)")
+    solve_args.add_argument("days", type=int, nargs="+", help="Days to run (integers)")
+    solve_args.add_argument("-s", action="store_true", help="Run with sample input")
+    solve_args.add_argument("-o1", action="store_true", help="Only run part 1")
+    solve_args.add_argument("-o2", action="store_true", help="Only run part 2")
+    input_args = solve_args.add_mutually_exclusive_group()
+    input_args.add_argument("--input", type=Path, help="Solve this file instead of the day's own")
+    input_args.add_argument("--stdin", action="store_true", help="Solve the input piped in")
+
+    subparsers.add_parser("stop", help="Shut the daemon down")
+
+    opts = args.parse_args()
+
+    if opts.command == "serve":
+        serve(opts.socket, opts.days)
+        return
+
+    with DaemonClient(opts.socket) as client:
+        if opts.command == "stop":
+            client.shutdown()
+            return
+
+        failed = False
+        for request in _iter_requests(opts):
+            response = client.solve(**request)
+            failed = failed or not response["ok"]
+            print(json.dumps(response))
+        if failed:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -18,4 +18,4 @@ class DayX(Solver):
 
 def solve_day(day: int, use_sample: bool, run_each: List[bool]):
     solver = DayX(day, use_sample, run_each)
-    solver.solve()
+    return solver.solve()
@@ -2,6 +2,7 @@ import re
 from typing import List
 
 from solver import Solver
+from utils.data_loader import MappedLines
 
 LETTERS_TO_NUMS = {
     "zero": "0",
@@ -15,50 +16,50 @@ LETTERS_TO_NUMS = {
     "eight": "8",
     "nine": "9",
 }
+BYTES_TO_NUMS = {k.encode(): int(v) for k, v in LETTERS_TO_NUMS.items()}
+BYTES_TO_NUMS.update({v.encode(): int(v) for v in LETTERS_TO_NUMS.values()})
+
+# One match per line: the first digit, and the last digit (greedy, so as far right as possible)
+FIRST_DIGIT = re.compile(rb"^[^\d\n]*(\d)", re.MULTILINE)
+LAST_DIGIT = re.compile(rb"^[^\n]*(\d)", re.MULTILINE)
+
+NUMS_PATTERN = b"|".join([rb"\d"] + list(BYTES_TO_NUMS.keys()))
+FIRST_NUM = re.compile(rb"^[^\n]*?(" + NUMS_PATTERN + rb")", re.MULTILINE)
+LAST_NUM = re.compile(rb"^[^\n]*(" + NUMS_PATTERN + rb")", re.MULTILINE)
 
 
 class Day01(Solver):
+    input_mode = "mmap"  # Both parts only need a regex pass over the raw bytes
+
     def __init__(self, day: int, use_sample: bool, run_each: List[bool]) -> None:
         super().__init__(use_sample, run_each)
         self.my_base_path = __file__
         self.day = day
 
-    def part1(self, data: List[str]) -> None:
+    def part1(self, data: MappedLines) -> None:
         """Simply only take what is a digit, and then combine the first and
-        last one (this will still work if there is only one)
-
+        last one (this will still work if there is only one). Both are found
+        with a regex over the whole (memory mapped) input, anchored to the
+        start of each line, so the input never has to be split or decoded.
         """
-        calibrations = []
-        for line in data:
-            new_calib = [x for x in line if x.isdigit()]
-            calibrations.append(int(new_calib[0] + new_calib[-1]))
+        firsts = FIRST_DIGIT.findall(data.buffer)
+        lasts = LAST_DIGIT.findall(data.buffer)
+        return sum(10 * int(first) + int(last) for first, last in zip(firsts, lasts))
 
-        return sum(calibrations)
-
-    def part2(self, data: List[str]) -> None:
-        """Here we do a similar thing, though we also track the occurences of
-        any individual word. The trick is that overlapping words MUST COUNT
-        separately (something I did not grasp for stupidly long), and then we
-        only need to replace the index of occurence with the digit for the
-        concatenation algorithm to work.
+    def part2(self, data: MappedLines) -> None:
+        """Here we do a similar thing, though words count as digits too. The
+        trick is that overlapping words MUST COUNT separately (something I did
+        not grasp for stupidly long) - e.g. "eightwo" ends in a two. Searching
+        for the first match lazily and the last match greedily from the start
+        of the line gets that right without ever replacing anything.
         """
-        calibrations = []
-        for line in data:
-            nums_in_str = {}
-            for num_str in LETTERS_TO_NUMS.keys():
-                str_locations = [m.start() for m in re.finditer(num_str, line)]
-                for str_location in str_locations:
-                    nums_in_str[str_location] = num_str
-
-            for idx, num_str in nums_in_str.items():
-                line = line[:idx] + LETTERS_TO_NUMS[num_str] + line[idx + 1 :]
-
-            new_calib = [x for x in line if x.isdigit()]
-            calibrations.append(int(new_calib[0] + new_calib[-1]))
-
-        return sum(calibrations)
+        firsts = FIRST_NUM.findall(data.buffer)
+        lasts = LAST_NUM.findall(data.buffer)
+        return sum(
+            10 * BYTES_TO_NUMS[first] + BYTES_TO_NUMS[last] for first, last in zip(firsts, lasts)
+        )
 
 
 def solve_day(day: int, use_sample: bool, run_each: List[bool]):
     solver = Day01(day, use_sample, run_each)
-    solver.solve()
+    return solver.solve()
@@ -1,11 +1,9 @@
 import math
 from typing import List, Tuple
 
-import numpy as np
-
 from solver import Solver
 from utils.parsers import NumpyArrayParser
-import utils.grid_utils as grid_utils
+from utils.grid_utils import Grid
 
 NUMS = "1234567890"
 
@@ -64,27 +62,28 @@ class Day03(Solver):
         function, and importantly, we track what positions we have visited.
         This is important because we use this to not double up any extractions.
         """
-        self.arr = NumpyArrayParser(data).parse()
+        with self.phase("parse"):
+            self.arr = self.cache_parse("grid", lambda: NumpyArrayParser(data).parse())
+
+        grid_nav = Grid.for_shape(self.arr.shape, include_diagonals=True)
+        flat_arr = self.arr.ravel().tolist()
 
         part_nums = []
         considered_positions = set([])
-        for i in range(self.arr.shape[0]):
-            for j in range(self.arr.shape[1]):
-                if self.arr[i, j] in NUMS + ".":
+        for flat_pos, cell in enumerate(flat_arr):
+            if cell in NUMS + ".":
+                continue
+            # Now, seek for any valid numbers
+            for check_flat_pos in grid_nav.neighbours(flat_pos):
+                if flat_arr[check_flat_pos] not in NUMS:
                     continue
-                # Now, seek for any valid numbers
-                candidate_positions = grid_utils.get_adjacent_positions((i, j), self.arr.shape)
-                for check_pos in candidate_positions:
-                    if check_pos in considered_positions:
-                        continue
-                    if self.arr[check_pos[0], check_pos[1]] not in NUMS:
-                        continue
-
-                    single_considered_positions, part_num = self.__seek_for_number_lr(check_pos)
-                    considered_positions = considered_positions.union(
-                        set(single_considered_positions)
-                    )
-                    part_nums.append(part_num)
+                check_pos = grid_nav.to_pos(check_flat_pos)
+                if check_pos in considered_positions:
+                    continue
+
+                single_considered_positions, part_num = self.__seek_for_number_lr(check_pos)
+                considered_positions.update(single_considered_positions)
+                part_nums.append(part_num)
 
         return sum(part_nums)
 
@@ -94,38 +93,38 @@ class Day03(Solver):
         logic as in part 1, then we consider it a valid gear ratio and add it
         to the list.
         """
-        self.arr = NumpyArrayParser(data).parse()
+        with self.phase("parse"):
+            self.arr = self.cache_parse("grid", lambda: NumpyArrayParser(data).parse())
+
+        grid_nav = Grid.for_shape(self.arr.shape, include_diagonals=True)
+        flat_arr = self.arr.ravel().tolist()
 
         gear_ratios = []
         considered_positions = set([])
-        for i in range(self.arr.shape[0]):
-            for j in range(self.arr.shape[1]):
-                if self.arr[i, j] != "*":
+        for flat_pos, cell in enumerate(flat_arr):
+            if cell != "*":
+                continue
+            gear_parts = []
+
+            # Now, as before seek for any valid numbers. Repeated code but
+            # small enough to not get a refactor
+            for check_flat_pos in grid_nav.neighbours(flat_pos):
+                if flat_arr[check_flat_pos] not in NUMS:
+                    continue
+                check_pos = grid_nav.to_pos(check_flat_pos)
+                if check_pos in considered_positions:
                     continue
-                gear_parts = []
-
-                # Now, as before seek for any valid numbers. Repeated code but
-                # small enough to not get a refactor
-
-                candidate_positions = grid_utils.get_adjacent_positions((i, j), self.arr.shape)
-                for check_pos in candidate_positions:
-                    if check_pos in considered_positions:
-                        continue
-                    if self.arr[check_pos[0], check_pos[1]] not in NUMS:
-                        continue
 
-                    single_considered_positions, part_num = self.__seek_for_number_lr(check_pos)
-                    considered_positions = considered_positions.union(
-                        set(single_considered_positions)
-                    )
-                    gear_parts.append(part_num)
+                single_considered_positions, part_num = self.__seek_for_number_lr(check_pos)
+                considered_positions.update(single_considered_positions)
+                gear_parts.append(part_num)
 
-                if len(gear_parts) == 2:  # Gear identified
-                    gear_ratios.append(math.prod(gear_parts))
+            if len(gear_parts) == 2:  # Gear identified
+                gear_ratios.append(math.prod(gear_parts))
 
         return sum(gear_ratios)
 
 
 def solve_day(day: int, use_sample: bool, run_each: List[bool]):
     solver = Day03(day, use_sample, run_each)
-    solver.solve()
+    return solver.solve()
@@ -67,4 +67,4 @@ class Day06(Solver):
 
 def solve_day(day: int, use_sample: bool, run_each: List[bool]):
     solver = Day06(day, use_sample, run_each)
-    solver.solve()
+    return solver.solve()
@@ -4,7 +4,7 @@ from functools import cmp_to_key
 from itertools import product
 from typing import List, Tuple, Dict
 
-from solver import Solver
+from solver import Solver, artifact
 
 
 class Day07(Solver):
@@ -79,12 +79,14 @@ class Day07(Solver):
 
         return hand1["hand_class"] - hand2["hand_class"]
 
-    def __make_hands(self, data: List[str]) -> None:
+    @artifact
+    def __make_hands(self, data: List[str]) -> List[Dict]:
         """We need a couple of special properties other than the hand and the
         bid - first, we need to determine the class (see __get_class_of_hand())
         so we can do easy comparisons, and secondly we need the original hand.
         This is important for part 2, which relies on the original hand, not
-        the new one with jokers replaced, for tiebreaks.
+        the new one with jokers replaced, for tiebreaks. Part 2 starts from
+        these hands, so they are only worked out once per input.
         """
         cards_breakdown = []
         for line in data:
@@ -97,10 +99,7 @@ class Day07(Solver):
                     "hand_class": self.__get_class_of_hand(hand),
                 }
             )
-        cards_breakdown = sorted(
-            cards_breakdown, key=cmp_to_key(lambda x, y: self.__compare_hands(x, y))
-        )
-        self.cards_breakdown = cards_breakdown
+        return sorted(cards_breakdown, key=cmp_to_key(lambda x, y: self.__compare_hands(x, y)))
 
     def __make_best_hand(self, hand_spec: Dict) -> Dict:
         """Simply, any time there is a 'J' present, we instead substitute it
@@ -146,7 +145,7 @@ class Day07(Solver):
         """The most complicated part here is the custom sort (see
         __compare_hands())
         """
-        self.__make_hands(data)
+        self.cards_breakdown = self.__make_hands(data)
 
         res_sum = 0
         for idx, hand_spec in enumerate(self.cards_breakdown):
@@ -159,7 +158,7 @@ class Day07(Solver):
         need to rebuild the hands with the choices, which can be seen in
         __make_best_hand().
         """
-        self.__make_hands(data)
+        self.cards_breakdown = self.__make_hands(data)
 
         updated_cards = []
         for hand_spec in self.cards_breakdown:
@@ -178,4 +177,4 @@ class Day07(Solver):
 
 def solve_day(day: int, use_sample: bool, run_each: List[bool]):
     solver = Day07(day, use_sample, run_each)
-    solver.solve()
+    return solver.solve()
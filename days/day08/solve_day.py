@@ -29,7 +29,8 @@ class Day08(Solver):
         """This just simulates the process until the node is
         encountered. Nothing particularly clever here.
         """
-        self.__make_grid(data)
+        with self.phase("parse"):
+            self.__make_grid(data)
         curr_node = "AAA"
 
         instructions = deepcopy(self.instructions)
@@ -49,7 +50,8 @@ class Day08(Solver):
         the length of each "loop" to the end node, we can just find the
         LCM and that must be the solution.
         """
-        self.__make_grid(data)
+        with self.phase("parse"):
+            self.__make_grid(data)
         curr_nodes = [x for x in self.grid_info.keys() if x.endswith("A")]
         instructions = deepcopy(self.instructions)
 
@@ -69,4 +71,4 @@ class Day08(Solver):
 
 def solve_day(day: int, use_sample: bool, run_each: List[bool]):
     solver = Day08(day, use_sample, run_each)
-    solver.solve()
+    return solver.solve()
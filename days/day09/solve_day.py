@@ -1,37 +1,35 @@
-from copy import deepcopy
 from typing import List
 
 from solver import Solver
+from utils.data_loader import MappedLines
 
 
 class Day09(Solver):
+    input_mode = "mmap"  # Every line is its own sequence, so lines can be shared out to processes
+
     def __init__(self, day: int, use_sample: bool, run_each: List[bool]) -> None:
         super().__init__(use_sample, run_each)
         self.my_base_path = __file__
         self.day = day
 
-    def __make_sequences_histories(self, sequences: List[List[int]]) -> None:
-        """Generate the sequence histories as per the specification.
-        This just steps through the algorithm for each line until all
+    def __make_sequence_history(self, line: str) -> List[List[int]]:
+        """Generate the sequence history as per the specification.
+        This just steps through the algorithm for the line until all
         0's are encountered. The only trick here is, for convenience, we
         stack it such that the smallest sequence (all 0s) is at the
         first index of the list, so we don't need to bother literally
         reversing the index when we "go back up" the structure.
         """
-        all_stepped_sequences = []
-        for sequence in sequences:
-            sequence_steps = [sequence]
-
-            while any([n != 0 for n in sequence_steps[0]]):
-                next_seq = []
-                for idx in range(len(sequence_steps[0]) - 1):
-                    next_seq.append(sequence_steps[0][idx + 1] - sequence_steps[0][idx])
+        sequence_steps = [[int(x) for x in line.split(" ")]]
 
-                sequence_steps = [next_seq] + sequence_steps
+        while any([n != 0 for n in sequence_steps[0]]):
+            next_seq = []
+            for idx in range(len(sequence_steps[0]) - 1):
+                next_seq.append(sequence_steps[0][idx + 1] - sequence_steps[0][idx])
 
-            all_stepped_sequences.append(sequence_steps)
+            sequence_steps = [next_seq] + sequence_steps
 
-        self.all_stepped_sequences = all_stepped_sequences
+        return sequence_steps
 
     def __solve_sequences_end_history(self, sequence_steps) -> int:
         """Given the trick, we just need to initialise a new 0 value,
@@ -58,27 +56,19 @@ class Day09(Solver):
 
         return sequence_steps[-1][0]
 
-    def part1(self, data: List[str]) -> None:
-        sequences = [[int(x) for x in line.split(" ")] for line in data]
-        self.__make_sequences_histories(sequences)
-
-        all_stepped_sequences = deepcopy(self.all_stepped_sequences)
-        sequence_solutions = [self.__solve_sequences_end_history(s) for s in all_stepped_sequences]
-
-        return sum(sequence_solutions)
+    def __next_value(self, line: str) -> int:
+        return self.__solve_sequences_end_history(self.__make_sequence_history(line))
 
-    def part2(self, data: List[str]) -> None:
-        sequences = [[int(x) for x in line.split(" ")] for line in data]
-        self.__make_sequences_histories(sequences)
+    def __previous_value(self, line: str) -> int:
+        return self.__solve_sequences_start_history(self.__make_sequence_history(line))
 
-        all_stepped_sequences = deepcopy(self.all_stepped_sequences)
-        sequence_solutions = [
-            self.__solve_sequences_start_history(s) for s in all_stepped_sequences
-        ]
+    def part1(self, data: MappedLines) -> None:
+        return self.map_lines(data, self.__next_value)
 
-        return sum(sequence_solutions)
+    def part2(self, data: MappedLines) -> None:
+        return self.map_lines(data, self.__previous_value)
 
 
 def solve_day(day: int, use_sample: bool, run_each: List[bool]):
     solver = Day09(day, use_sample, run_each)
-    solver.solve()
+    return solver.solve()
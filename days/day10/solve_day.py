@@ -1,11 +1,11 @@
 from collections import Counter
-from typing import List
+from typing import List, Tuple
 
 import numpy as np
 
 from utils.parsers import NumpyArrayParser
-from utils.grid_utils import get_adjacent_positions
-from solver import Solver
+from utils.grid_utils import flood_fill, get_adjacent_positions
+from solver import Solver, artifact
 
 
 class Day10(Solver):
@@ -33,7 +33,7 @@ class Day10(Solver):
 
         self.OPPOSITES = {"N": "S", "S": "N", "E": "W", "W": "E"}
 
-    def __make_loop(self, grid: np.array) -> None:
+    def __make_loop(self, grid: np.array) -> List[Tuple[int]]:
         """Here, we consider each adjacent node as a start point and then
         attempt to construct the loop. If we find our way back to the start node
         we can assume the loop is complete, and then half the amount of nodes.
@@ -42,7 +42,7 @@ class Day10(Solver):
         not excluding the case where the first adjacent node does not connect
         to the start node - these SHOULD be excluded.
         """
-        start_node = tuple([int(x) for x in np.where(grid == "S")])
+        start_node = tuple([int(x[0]) for x in np.where(grid == "S")])
 
         # Set up loops - each loop will start from the first node and continue
         # evaluating until the loop is closed or not possible to close
@@ -52,6 +52,8 @@ class Day10(Solver):
         ]
 
         for loop_start in final_connecting_nodes:
+            if grid[loop_start] not in self.CONNECTIONS:
+                continue  # Ground tile, cannot be part of the loop
             loop = [start_node, loop_start]
 
             connected = False  # True when the last node is start node
@@ -92,19 +94,25 @@ class Day10(Solver):
                 loop.append(new_node)
                 connected = grid[new_node] == "S"
 
-            if not connected:
-                # If we have gotten here from a break, we need to try a new loop
-                continue
+            if connected:
+                return loop
+            # Otherwise we have gotten here from a break, so try a new loop
+
+        raise ValueError(f"No loop through S at {start_node} - check the input")
 
-        self.loop = loop
+    @artifact
+    def __find_pipe_loop(self, data: List[str]) -> Tuple[np.array, List[Tuple[int]]]:
+        """Both parts need the grid and the loop through it"""
+        with self.phase("parse"):
+            grid = NumpyArrayParser(data).parse()
+        return grid, self.__make_loop(grid)
 
     def part1(self, data: List[str]) -> None:
-        self.grid = NumpyArrayParser(data).parse()
-        self.__make_loop(self.grid)
+        self.grid, self.loop = self.__find_pipe_loop(data)
 
         return (len(self.loop) - 1) // 2
 
-    def part2(self, _data: List[str]) -> None:
+    def part2(self, data: List[str]) -> None:
         """The tricky part here is that we need to consider the possibility
         where there are two pipes side by side, e.g. ||, which STILL encloses
         a loop.
@@ -118,6 +126,8 @@ class Day10(Solver):
         assume all directions so we can make the "wall" of the expanded grid.
         This will not affect us as they will not come into the final calculation
         """
+        self.grid, self.loop = self.__find_pipe_loop(data)
+
         big_grid = np.ones((3 * self.grid.shape[0], 3 * self.grid.shape[1]), dtype=str)
         big_grid[big_grid == "1"] = "."
         big_loop = [tuple([3 * i for i in c]) for c in self.loop]
@@ -137,46 +147,19 @@ class Day10(Solver):
                 dir_tuple = self.DIRECTIONS_TO_TUPLES[each_dir]
                 big_grid[big_pipe_coord[0] + dir_tuple[0], big_pipe_coord[1] + dir_tuple[1]] = "#"
 
-        # Get all of the outside edges - we will use them as starting points for
-        # a flood fill
-        outside_edges = [(0, y) for y in range(big_grid.shape[1])]
-        outside_edges += [(big_grid.shape[0] - 1, y) for y in range(big_grid.shape[1])]
-        outside_edges += [(x, 0) for x in range(big_grid.shape[0])]
-        outside_edges += [(x, big_grid.shape[1] - 1) for x in range(big_grid.shape[0])]
-
-        outside_edges = [c for c in outside_edges if big_grid[c] == "."]
-
-        out_of_loop = set([])
-        for start_fill in outside_edges:
-            if start_fill in out_of_loop:
-                continue
-            frontier = [start_fill]
-            while len(frontier) > 0:
-                next_node = frontier.pop(0)
-                out_of_loop.add(next_node)
-                neighbours = get_adjacent_positions(next_node, big_grid.shape)
-                for neighbour in neighbours:
-                    if neighbour in out_of_loop or neighbour in frontier:
-                        continue
-                    if big_grid[neighbour] == ".":
-                        frontier.append(neighbour)
-
-        for ool in list(out_of_loop):
-            big_grid[ool] = "X"
-
-        total_enclosed = 0
-        counted = 0
-        for i in range(self.grid.shape[0]):
-            for j in range(self.grid.shape[1]):
-                if big_grid[3 * i, 3 * j] == ".":
-                    total_enclosed += 1
-
-                big_grid[3 * i, 3 * j] = counted
-                counted += 1
+        # All of the outside edges are starting points for a flood fill, and
+        # whatever open space it does not reach is enclosed by the loop
+        open_space = big_grid == "."
+        outside_edges = np.zeros(big_grid.shape, dtype=bool)
+        outside_edges[[0, -1], :] = True
+        outside_edges[:, [0, -1]] = True
+        out_of_loop = flood_fill(open_space, outside_edges, include_diagonals=True)
 
-        return total_enclosed
+        # Only the top left of each 3x3 block is an original tile
+        enclosed = open_space & ~out_of_loop
+        return int(enclosed[::3, ::3].sum())
 
 
 def solve_day(day: int, use_sample: bool, run_each: List[bool]):
     solver = Day10(day, use_sample, run_each)
-    solver.solve()
+    return solver.solve()
@@ -7,6 +7,9 @@ from solver import Solver
 from utils.parsers import NumpyArrayParser
 
 
+EMPTY, GALAXY = 0, 1  # Symbol codes from parse_codes(".#")
+
+
 class Day11(Solver):
     def __init__(self, day: int, use_sample: bool, run_each: List[bool]) -> None:
         super().__init__(use_sample, run_each)
@@ -44,10 +47,10 @@ class Day11(Solver):
         expand_cols = []
         expand_rows = []
         for col in range(grid.shape[1]):
-            if len(np.unique(grid[:, col])) == 1 and grid[0, col] == ".":
+            if len(np.unique(grid[:, col])) == 1 and grid[0, col] == EMPTY:
                 expand_cols.append(col)
         for row in range(grid.shape[0]):
-            if len(np.unique(grid[row, :])) == 1 and grid[row, 0] == ".":
+            if len(np.unique(grid[row, :])) == 1 and grid[row, 0] == EMPTY:
                 expand_rows.append(row)
 
         return expand_cols, expand_rows
@@ -58,7 +61,7 @@ class Day11(Solver):
 
         for i in range(grid.shape[0]):
             for j in range(grid.shape[1]):
-                if grid[i, j] == "#":
+                if grid[i, j] == GALAXY:
                     galaxy_locations.append((i, j))
         return galaxy_locations
 
@@ -104,17 +107,19 @@ class Day11(Solver):
         return sum(galaxy_lens)
 
     def part1(self, data: List[str]) -> None:
-        grid = NumpyArrayParser(data).parse()
+        with self.phase("parse"):
+            grid = self.cache_parse("grid", lambda: NumpyArrayParser(data).parse_codes(".#"))
         offset_multiplier = 2
 
         return self.__get_galaxy_lens(grid, offset_multiplier)
 
     def part2(self, data: List[str]) -> None:
-        grid = NumpyArrayParser(data).parse()
+        with self.phase("parse"):
+            grid = self.cache_parse("grid", lambda: NumpyArrayParser(data).parse_codes(".#"))
         offset_multiplier = 1000000
         return self.__get_galaxy_lens(grid, offset_multiplier)
 
 
 def solve_day(day: int, use_sample: bool, run_each: List[bool]):
     solver = Day11(day, use_sample, run_each)
-    solver.solve()
+    return solver.solve()
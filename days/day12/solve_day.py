@@ -1,30 +1,29 @@
 from collections import Counter
-import concurrent.futures as cf
-from functools import cache
 from itertools import product
-import os
 from typing import List, Tuple
 
 from solver import Solver
+from utils.data_loader import MappedLines
+from utils.memo import memoize
+
+MEMO_SIZE = 10000  # Results kept at once - far more than any one line needs
 
 
 class Day12(Solver):
+    input_mode = "mmap"  # Every line is counted on its own, so lines can be shared out to processes
+
     def __init__(self, day: int, use_sample: bool, run_each: List[bool]) -> None:
         super().__init__(use_sample, run_each)
         self.my_base_path = __file__
         self.day = day
         self.OPTS = [".", "#"]
 
-    def __make_arrangements(self, data: List[str], repeats: int = 1) -> List[Tuple]:
-        arrangements = []
-        for line in data:
-            arrangement, spec = line.split(" ")
-
-            arrangement = "?".join([arrangement] * repeats)
-            spec = [int(x) for x in spec.split(",")] * repeats
-            arrangements.append((arrangement, tuple(spec)))
+    def __make_arrangement(self, line: str, repeats: int = 1) -> Tuple[str, Tuple[int]]:
+        arrangement, spec = line.split(" ")
 
-        return arrangements
+        arrangement = "?".join([arrangement] * repeats)
+        spec = [int(x) for x in spec.split(",")] * repeats
+        return arrangement, tuple(spec)
 
     def __check_valid(self, arrangement: List[str], spec: List[int]) -> bool:
         continuous_ranges = [len(x) for x in arrangement.split(".") if len(x) > 0]
@@ -44,16 +43,13 @@ class Day12(Solver):
 
         return num_arrangements
 
-    def part1(self, data: List[str]) -> None:
-        arrangements = self.__make_arrangements(data, repeats=1)
+    def __count_line_brute_force(self, line: str) -> int:
+        return self.__check_total_arrangements(*self.__make_arrangement(line, repeats=1))
 
-        total_arrangements = 0
-        for arrangement, spec in arrangements:
-            total_arrangements += self.__check_total_arrangements(arrangement, spec)
+    def part1(self, data: MappedLines) -> None:
+        return self.map_lines(data, self.__count_line_brute_force)
 
-        return total_arrangements
-
-    @cache
+    @memoize(maxsize=MEMO_SIZE)
     def __dfs(self, sequence: str, spec: Tuple[int]) -> int:
         """Here, we have pretty much directly deployed mgtezak's solution
         https://github.com/mgtezak/Advent_of_Code/blob/master/2023/Day_12.py
@@ -77,18 +73,13 @@ class Day12(Solver):
             return skip
         return skip + self.__dfs(sequence[spec_len + 1 :], tuple(spec[1:]))
 
-    def part2(self, data: List[str]) -> None:
-        arrangements = self.__make_arrangements(data, repeats=5)
-
-        total_arrangements = 0
-
-        for arrangement in arrangements:
-            sequence, spec = arrangement
-            total_arrangements += self.__dfs(sequence, spec)
+    def __count_line_unfolded(self, line: str) -> int:
+        return self.__dfs(*self.__make_arrangement(line, repeats=5))
 
-        return total_arrangements
+    def part2(self, data: MappedLines) -> None:
+        return self.map_lines(data, self.__count_line_unfolded)
 
 
 def solve_day(day: int, use_sample: bool, run_each: List[bool]):
     solver = Day12(day, use_sample, run_each)
-    solver.solve()
+    return solver.solve()
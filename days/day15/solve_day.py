@@ -53,4 +53,4 @@ class Day15(Solver):
 
 def solve_day(day: int, use_sample: bool, run_each: List[bool]):
     solver = Day15(day, use_sample, run_each)
-    solver.solve()
+    return solver.solve()
@@ -4,6 +4,7 @@ import numpy as np
 
 from solver import Solver
 from utils.parsers import NumpyArrayParser
+from utils.shared_grid import SharedGrid, share_grid
 
 
 class Day16(Solver):
@@ -131,16 +132,25 @@ class Day16(Solver):
     def part1(self, data: List[str]) -> None:
         """Nothing major to explain - just implement the cases as described and
         simulate each beam."""
-        grid = NumpyArrayParser(data).parse()
+        with self.phase("parse"):
+            grid = self.cache_parse("grid", lambda: NumpyArrayParser(data).parse())
         start_beam = ((0, -1), self.DIRECTIONS_TO_TUPLES["E"])
 
         return self.__simulate_grid(grid, start_beam)
 
+    def __simulate_shared_grid(
+        self, grid: SharedGrid, starting_beam: Tuple[Tuple[int], str]
+    ) -> int:
+        return self.__simulate_grid(grid.array, starting_beam)
+
     def part2(self, data: List[str]) -> None:
-        """We simply check all possible starts on the grid and get a solution
-        quickly enough
+        """We simply check all possible starts on the grid. Every start is
+        independent, so they can be shared out to worker processes - if they
+        are, the grid is put in shared memory once rather than being pickled
+        with every start.
         """
-        grid = NumpyArrayParser(data).parse()
+        with self.phase("parse"):
+            grid = self.cache_parse("grid", lambda: NumpyArrayParser(data).parse())
 
         all_starts = []
         for i in range(grid.shape[0]):
@@ -151,13 +161,12 @@ class Day16(Solver):
             all_starts.append(((-1, j), self.DIRECTIONS_TO_TUPLES["S"]))
             all_starts.append(((grid.shape[0], j), self.DIRECTIONS_TO_TUPLES["N"]))
 
-        energized_results = []
-        for start in all_starts:
-            energized_results.append(self.__simulate_grid(grid, start))
-
-        return max(energized_results)
+        with share_grid(grid) as shared_grid:
+            return self.map_items(
+                self.__simulate_shared_grid, [(shared_grid, x) for x in all_starts], reduce=max
+            )
 
 
 def solve_day(day: int, use_sample: bool, run_each: List[bool]):
     solver = Day16(day, use_sample, run_each)
-    solver.solve()
+    return solver.solve()
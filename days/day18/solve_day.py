@@ -1,12 +1,14 @@
-from typing import List, Tuple
+from typing import Iterator, List, Tuple
 
 import numpy as np
 
 from solver import Solver
-from utils.grid_utils import get_adjacent_positions
+from utils.grid_utils import flood_fill
 
 
 class Day18(Solver):
+    input_mode = "stream"  # Both parts only walk the dig plan once, in order
+
     def __init__(self, day: int, use_sample: bool, run_each: List[bool]) -> None:
         super().__init__(use_sample, run_each)
         self.my_base_path = __file__
@@ -19,7 +21,7 @@ class Day18(Solver):
     def is_in_grid(self, input_tuple: Tuple[int], grid_shape: Tuple[int]) -> bool:
         return (0 < input_tuple[0] < grid_shape[0]) and (0 < input_tuple[1] < grid_shape[1])
 
-    def part1(self, data: List[str]) -> None:
+    def part1(self, data: Iterator[str]) -> None:
         """We went for the naive solution because I thought the colours would be
         real and we would draw something pretty. Due to this, we construct the
         specified grid and flood fill it (similar to day 10). That will not work
@@ -59,32 +61,24 @@ class Day18(Solver):
 
         grid = np.pad(grid, pad_width=1, mode="constant")
 
-        # Flood fill the grid with twos
-        explored = set([])
-        frontier = [(0, 0)]
-        while len(frontier) > 0:
-            next_node = frontier.pop()
-            grid[next_node] = 2
-            explored.add(next_node)
-            neighbours = get_adjacent_positions(next_node, grid.shape)
-            for neighour in neighbours:
-                if grid[neighour] == 0:
-                    frontier.append(neighour)
-
-        grid[np.where(grid == 0)] = 1
-        grid[np.where(grid == 2)] = 0
-        return int(grid.sum())
-
-    def part2(self, data: List[str]) -> None:
-        """The area of a polygon with n known vertices is the sum of the
-        multiple of the sum of the diffs between verticies. Why? I googled it,
-        trusted it, implemented it, and it gave me the right answer. I had to
-        compensate for the floor divide I think - not exactly sure why I was one
-        off.
+        # Flood fill the outside, then everything else is trench or dug out
+        outside = flood_fill(grid == 0, [(0, 0)], include_diagonals=True)
+        return int((~outside).sum())
+
+    def part2(self, data: Iterator[str]) -> None:
+        """The area of a polygon with n known vertices is half the sum of the
+        cross products of each pair of neighbouring vertices (the shoelace
+        formula). Why? I googled it, trusted it, implemented it. Each term only
+        needs the previous vertex, so it is summed as the lines are read rather
+        than keeping every vertex. Half the perimeter (plus one) is added on
+        as the trench itself is a metre wide.
+
+        The first version of this left out the term for the last edge, which
+        is where the "one off" I was compensating for came from - so this
+        gives a different (and now correct) answer to that version.
         """
-        polygon_x = [0]
-        polygon_y = [0]
-
+        curr_cell = (0, 0)
+        double_area = 0
         perimeter = 0
         for line in data:
             _, _, direction_spec = line.split(" ")
@@ -92,31 +86,16 @@ class Day18(Solver):
             direction_spec = direction_spec.replace("(#", "").replace(")", "")
             direction = self.HEX_SPEC_TO_DIRECTION[direction_spec[-1]]
             dist = int(direction_spec[:-1], 16)
-            match direction:
-                case "U":
-                    polygon_x.append(polygon_x[-1])
-                    polygon_y.append(polygon_y[-1] + dist)
-                case "D":
-                    polygon_x.append(polygon_x[-1])
-                    polygon_y.append(polygon_y[-1] - dist)
-                case "R":
-                    polygon_x.append(polygon_x[-1] + dist)
-                    polygon_y.append(polygon_y[-1])
-                case "L":
-                    polygon_x.append(polygon_x[-1] - dist)
-                    polygon_y.append(polygon_y[-1])
-                case _:
-                    raise ValueError(f"Cannot determine direction {direction}")
+
+            step = self.DIRECTIONS_TO_TUPLES[direction]
+            next_cell = (curr_cell[0] + step[0] * dist, curr_cell[1] + step[1] * dist)
+            double_area += curr_cell[0] * next_cell[1] - next_cell[0] * curr_cell[1]
             perimeter += dist
-        area = 0
-        j = -1
+            curr_cell = next_cell
 
-        for i in range(len(polygon_x) - 1):
-            area += (polygon_x[j] + polygon_x[i]) * (polygon_y[j] - polygon_y[i])
-            j = i
-        return (area + perimeter) // 2 + 1  # +1 to compensate for floor divide
+        return (abs(double_area) + perimeter) // 2 + 1
 
 
 def solve_day(day: int, use_sample: bool, run_each: List[bool]):
     solver = Day18(day, use_sample, run_each)
-    solver.solve()
+    return solver.solve()
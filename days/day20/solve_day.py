@@ -1,6 +1,7 @@
+from copy import deepcopy
 from enum import Enum, auto
 import math
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 from solver import Solver
 
@@ -96,7 +97,7 @@ class Day20(Solver):
     def return_false(self) -> bool:
         return False
 
-    def __make_modules(self, data: List[str]) -> None:
+    def __make_modules(self, data: List[str]) -> Dict[str, Module]:
         """We make modules based on the instructions using the handy constructor
         and enum above. The one extra part is to populate "missing modules",
         which are realistically only the output (rx) module, given that the
@@ -118,7 +119,7 @@ class Day20(Solver):
         module_list.extend(missing_module_list)
         for missing_module in missing_module_list:
             missing_module.populate_inputs(module_list)
-        self.modules = {x.module_name: x for x in module_list}
+        return {x.module_name: x for x in module_list}
 
     def __get_next_instructions(self, instruction_list: List[Tuple]) -> List[Tuple]:
         """We need to treat the instruction like a FIFO stack (i.e. a list)
@@ -144,7 +145,9 @@ class Day20(Solver):
         from the button push itself is already handled by considering the
         broadcaster as a normal module, but could equally be separated).
         """
-        self.__make_modules(data)
+        with self.phase("parse"):
+            # Modules hold their state, so each part needs its own copy
+            self.modules = deepcopy(self.cache_parse("modules", lambda: self.__make_modules(data)))
 
         high_pulse_count = 0
         low_pulse_count = 0
@@ -174,7 +177,9 @@ class Day20(Solver):
         Given the confusing state tracking below, this function is heavily
         commented.
         """
-        self.__make_modules(data)
+        with self.phase("parse"):
+            # Modules hold their state, so each part needs its own copy
+            self.modules = deepcopy(self.cache_parse("modules", lambda: self.__make_modules(data)))
 
         # Backpropagate from rx to find the necessary state of each combinator
         rx_input_module = self.modules[
@@ -236,4 +241,4 @@ class Day20(Solver):
 
 def solve_day(day: int, use_sample: bool, run_each: List[bool]):
     solver = Day20(day, use_sample, run_each)
-    solver.solve()
+    return solver.solve()
@@ -4,7 +4,7 @@ import numpy as np
 
 from solver import Solver
 from utils.parsers import NumpyArrayParser
-from utils.grid_utils import get_adjacent_positions, get_manhattan_dist
+from utils.grid_utils import BitGrid
 
 # CORRECT ANSWER IS 3642
 
@@ -12,6 +12,9 @@ X_P1 = 64
 X_P2 = 100
 
 
+GARDEN, ROCK, START = 0, 1, 2  # Symbol codes from parse_codes(".#S")
+
+
 class Day21(Solver):
     def __init__(self, day: int, use_sample: bool, run_each: List[bool]) -> None:
         super().__init__(use_sample, run_each)
@@ -52,39 +55,25 @@ class Day21(Solver):
         return new_positions
 
     def part1(self, data: List[str]) -> None:
-        grid = NumpyArrayParser(data).parse()
-        start_node = tuple([int(x) for x in np.where(grid == "S")])
-        adjacent_garden_tile_lookup = {}
-
-        for i in range(grid.shape[0]):
-            for j in range(grid.shape[1]):
-                if get_manhattan_dist((i, j), start_node) > X_P1:
-                    continue  # Not reachable in this test
-
-                curr_start_node = (i, j)
-                adjacent_garden_tile_lookup[curr_start_node] = []
-                adjacent_positions = get_adjacent_positions(
-                    curr_start_node, grid.shape, include_diagonals=False
-                )
-
-                for adjacent_position in adjacent_positions:
-                    if grid[adjacent_position] != "#":
-                        adjacent_garden_tile_lookup[curr_start_node].append(adjacent_position)
-
-        outer_steps = {0: [start_node]}
-        for idx in range(X_P1):
-            next_steps = []
-            for step in outer_steps[idx]:
-                next_steps.extend(adjacent_garden_tile_lookup[step])
+        """Step the whole frontier of reachable garden tiles at once - with the
+        frontier as a bit grid, its neighbours are four shifts or'd together,
+        and and-ing with the garden drops anything that landed on rock.
+        """
+        with self.phase("parse"):
+            grid = self.cache_parse("grid", lambda: NumpyArrayParser(data).parse_codes(".#S"))
 
-            outer_steps[idx + 1] = list(set(next_steps))  # Convert to set to remove duplicates
+        is_garden = BitGrid.from_mask(grid != ROCK)
+        frontier = BitGrid.from_mask(grid == START)
+        for _ in range(X_P1):
+            frontier = frontier.neighbours() & is_garden
 
-        return len(outer_steps[idx + 1])
+        return frontier.count()
 
     def part2(self, data: List[str]) -> None:
-        grid = NumpyArrayParser(data).parse()
+        with self.phase("parse"):
+            grid = self.cache_parse("grid", lambda: NumpyArrayParser(data).parse_codes(".#S"))
         adjacent_garden_tile_lookup = {}
-        start_node = (tuple([int(x) for x in np.where(grid == "S")]), (0, 0))
+        start_node = (tuple([int(x[0]) for x in np.where(grid == START)]), (0, 0))
 
         # This solution is mathematical. We can use the property that all grids
         # are always reachable in the least number of steps in the input, due
@@ -95,4 +84,4 @@ class Day21(Solver):
 
 def solve_day(day: int, use_sample: bool, run_each: List[bool]):
     solver = Day21(day, use_sample, run_each)
-    solver.solve()
+    return solver.solve()
@@ -63,7 +63,7 @@ class Day22(Solver):
         self.my_base_path = __file__
         self.day = day
 
-    def __make_and_settle_bricks(self, data: List[str]) -> None:
+    def __make_and_settle_bricks(self, data: List[str]) -> List[Brick]:
         bricks = sorted([Brick(*x.split("~"), idx) for idx, x in enumerate(data)])
         brick_lookup = {x.id: x for x in bricks}
 
@@ -83,10 +83,11 @@ class Day22(Solver):
                 ):
                     brick.supported_by.add(possible_below_brick)
 
-        self.bricks = bricks
+        return bricks
 
     def part1(self, data: List[str]) -> None:
-        self.__make_and_settle_bricks(data)
+        with self.phase("settle"):
+            self.bricks = self.cache_parse("bricks", lambda: self.__make_and_settle_bricks(data))
         cannot_disintegrate = set([])
 
         for brick in self.bricks:
@@ -96,7 +97,8 @@ class Day22(Solver):
         return len(self.bricks) - len(cannot_disintegrate)
 
     def part2(self, data: List[str]) -> None:
-        self.__make_and_settle_bricks(data)
+        with self.phase("settle"):
+            self.bricks = self.cache_parse("bricks", lambda: self.__make_and_settle_bricks(data))
         fall_results = {}
 
         for brick in self.bricks:
@@ -132,4 +134,4 @@ class Day22(Solver):
 
 def solve_day(day: int, use_sample: bool, run_each: List[bool]):
     solver = Day22(day, use_sample, run_each)
-    solver.solve()
+    return solver.solve()
@@ -1,36 +1,15 @@
-from queue import PriorityQueue
+from collections import deque
 from typing import List, Tuple
 
-import networkx as nx
-
 import numpy as np
 
 from solver import Solver
+from utils.graph import Graph
 from utils.parsers import NumpyArrayParser
-from utils.grid_utils import get_adjacent_positions
-
-
-class GridNode:
-    def __init__(self, parent: Tuple = None, position: Tuple = None, path_cost: int = 0):
-        self.parent = parent
-        self.position = position
-
-        self.path_cost = path_cost
+from utils.grid_utils import OUT_OF_BOUNDS, Grid, get_adjacent_positions
 
-        self.enter_direction = None
-        if not parent is None:
-            self.enter_direction = (
-                position[0] - parent.position[0],
-                position[1] - parent.position[1],
-            )
-
-        self.explored_mark = f"{self.position}"
-
-    def __eq__(self, other: object) -> bool:
-        self.explored_mark == other.explored_mark
-
-    def __lt__(self, other):
-        return self.path_cost < other.path_cost
+# Direction each slope allows, as an index into the steps of Grid's neighbour table
+SLOPE_STEPS = {"v": 0, "^": 1, ">": 2, "<": 3}
 
 
 class Day23(Solver):
@@ -39,15 +18,6 @@ class Day23(Solver):
         self.my_base_path = __file__
         self.day = day
 
-        self.TUPLES_TO_DIRECTIONS = {
-            (-1, 0): "N",
-            (1, 0): "S",
-            (0, 1): "E",
-            (0, -1): "W",
-        }
-
-        self.DIRECTIONS_TO_TUPLES = {y: x for x, y in self.TUPLES_TO_DIRECTIONS.items()}
-
     def __is_intersection(self, node: Tuple[int], grid: np.array) -> bool:
         if grid[node] != ".":
             return False
@@ -78,99 +48,62 @@ class Day23(Solver):
 
         self.intersections = intersections
 
+        # Walk out from each intersection along the paths (a flat index and the
+        # steps taken so far is all that needs tracking) until we hit another
+        grid_nav = Grid.for_shape(grid.shape)
+        flat_grid = grid.ravel()
+        intersection_flats = {grid_nav.to_flat(x) for x in intersections}
         intersection_map = {}
 
         for intersection in list(intersections):
-            frontier = [GridNode(None, intersection)]
-            explored = set([])
+            intersection_flat = grid_nav.to_flat(intersection)
+            frontier = deque([(intersection_flat, 0)])
+            explored = set([intersection_flat])
             while len(frontier) > 0:
-                curr_step = frontier.pop(0)
-                explored.add(curr_step.position)
-
-                candidates = [
-                    GridNode(curr_step, x, curr_step.path_cost + 1)
-                    for x in get_adjacent_positions(
-                        curr_step.position, grid.shape, include_diagonals=False
-                    )
-                ]
-
-                for candidate in candidates:
-                    if candidate.position in explored:
+                curr_flat, path_cost = frontier.popleft()
+
+                for step_idx, candidate in enumerate(grid_nav.neighbour_table[curr_flat].tolist()):
+                    if candidate == OUT_OF_BOUNDS or candidate in explored:
                         continue
 
-                    if candidate.position in intersections:
-                        intersection_map[(intersection, candidate.position)] = candidate.path_cost
+                    if candidate in intersection_flats:
+                        # Keep the longest if two paths join the same pair
+                        edge = (intersection, grid_nav.to_pos(candidate))
+                        intersection_map[edge] = max(intersection_map.get(edge, 0), path_cost + 1)
                         continue
 
-                    cell_type = grid[candidate.position]
+                    cell_type = flat_grid[candidate]
                     if cell_type == "#":
                         continue
-
-                    if cell_type == ".":
-                        frontier.append(candidate)
+                    # Slopes can only be stepped onto going downhill
+                    if cell_type in SLOPE_STEPS and SLOPE_STEPS[cell_type] != step_idx:
                         continue
 
-                    # If not, we need to check if it is traversable
-                    if (
-                        cell_type == "v"
-                        and self.TUPLES_TO_DIRECTIONS[candidate.enter_direction] != "S"
-                    ):
-                        continue
-                    elif (
-                        cell_type == "<"
-                        and self.TUPLES_TO_DIRECTIONS[candidate.enter_direction] != "W"
-                    ):
-                        continue
-                    elif (
-                        cell_type == ">"
-                        and self.TUPLES_TO_DIRECTIONS[candidate.enter_direction] != "E"
-                    ):
-                        continue
-                    elif (
-                        cell_type == "^"
-                        and self.TUPLES_TO_DIRECTIONS[candidate.enter_direction] != "N"
-                    ):
-                        continue
-                    else:
-                        frontier.append(candidate)
+                    explored.add(candidate)
+                    frontier.append((candidate, path_cost + 1))
 
         self.intersection_map = intersection_map
 
     def __make_graph(self) -> None:
-        self.graph = nx.DiGraph()
-
-        self.nodes = {n: idx for idx, n in enumerate(list(self.intersections))}
-        self.nodes_lookup = {y: x for x, y in self.nodes.items()}
+        self.graph = Graph()
 
-        self.graph.add_nodes_from(self.nodes.values())
+        for intersection in self.intersections:
+            self.graph.add_node(intersection)
 
         for edge_spec, cost in self.intersection_map.items():
-            edge = (self.nodes[e] for e in edge_spec)
-            self.graph.add_edge(*edge, weight=cost)
+            self.graph.add_edge(*edge_spec, weight=cost)
 
     def __solve_graph(self, start_node, goal_node) -> int:
-        subpath_cache = {}
-        max_len = 0
-        all_paths = set([])
-        path_lens = set([])
-        for path in nx.all_simple_paths(
-            self.graph, source=self.nodes[start_node], target=self.nodes[goal_node]
-        ):
-            total_len = 0
-            for idx in range(len(path) - 1):
-                total_len += self.intersection_map[
-                    (self.nodes_lookup[path[idx]], self.nodes_lookup[path[idx + 1]])
-                ]
-            max_len = max(max_len, total_len)
-            all_paths.add((x for x in path))
-            path_lens.add(total_len)
-
-        print(f"TOTAL PATHS {len(all_paths)}, TOTAL LENGTHS {len(path_lens)}")
-
-        return max_len
+        """Longest path through the intersections without revisiting any,
+        which is a DFS over every simple path keeping only the running total
+        """
+        return self.graph.longest_simple_path(
+            self.graph.node_id(start_node), self.graph.node_id(goal_node)
+        )
 
     def part1(self, data: List[str]) -> None:
-        grid = NumpyArrayParser(data).parse()
+        with self.phase("parse"):
+            grid = self.cache_parse("grid", lambda: NumpyArrayParser(data).parse())
 
         start_node = (0, 1)
         goal_node = (grid.shape[0] - 1, grid.shape[1] - 2)
@@ -180,11 +113,12 @@ class Day23(Solver):
         return self.__solve_graph(start_node, goal_node)
 
     def part2(self, data: List[str]) -> None:
-        grid = NumpyArrayParser(data).parse()
-        grid[grid == "^"] = "."
-        grid[grid == ">"] = "."
-        grid[grid == "<"] = "."
-        grid[grid == "v"] = "."
+        with self.phase("parse"):
+            grid = np.copy(self.cache_parse("grid", lambda: NumpyArrayParser(data).parse()))
+            grid[grid == "^"] = "."
+            grid[grid == ">"] = "."
+            grid[grid == "<"] = "."
+            grid[grid == "v"] = "."
 
         start_node = (0, 1)
         goal_node = (grid.shape[0] - 1, grid.shape[1] - 2)
@@ -196,4 +130,4 @@ class Day23(Solver):
 
 def solve_day(day: int, use_sample: bool, run_each: List[bool]):
     solver = Day23(day, use_sample, run_each)
-    solver.solve()
+    return solver.solve()
@@ -63,8 +63,9 @@ class Day24(Solver):
         self.day = day
 
     def part1(self, data: List[str]) -> None:
-        hailstones = [Hailstone(idx, line) for idx, line in enumerate(data)]
-        hailstones_lookup = {x.id: x for x in hailstones}
+        with self.phase("parse"):
+            hailstones = [Hailstone(idx, line) for idx, line in enumerate(data)]
+            hailstones_lookup = {x.id: x for x in hailstones}
 
         if self.use_sample:
             test_lim = (7, 27)
@@ -105,4 +106,4 @@ class Day24(Solver):
 
 def solve_day(day: int, use_sample: bool, run_each: List[bool]):
     solver = Day24(day, use_sample, run_each)
-    solver.solve()
+    return solver.solve()
@@ -1,10 +1,10 @@
-from itertools import combinations
-from typing import List
-
-import networkx as nx
-import matplotlib.pyplot as plt
+from collections import deque
+from typing import List, Optional
 
 from solver import Solver
+from utils.graph import Graph
+
+WIRES_TO_CUT = 3
 
 
 class Day25(Solver):
@@ -13,29 +13,53 @@ class Day25(Solver):
         self.my_base_path = __file__
         self.day = day
 
-    def part1(self, data: List[str]) -> None:
-        """networkx totally trivialised this problem, as there is a function
-        within the flow algorithms that calculate the minimum cuts required to
-        separate a flow between two nodes, and it is very fast. Just do so until
-        we have two groups split by 3 cuts."""
-        graph = nx.Graph()
+    def __find_cut_group_size(self, graph: Graph, source: int, sink: int) -> Optional[int]:
+        """Max flow between two components where every wire carries one unit,
+        found by pushing flow along BFS augmenting paths. If exactly
+        WIRES_TO_CUT paths fit, the wires between the two groups are the
+        minimum cut, and the components still reachable from the source (in
+        what capacity is left) are one of the groups.
+        """
+        flow = {}  # (from, to) -> +1 if a unit flows that way, -1 if it flows the other way
+        for num_paths in range(WIRES_TO_CUT + 1):
+            parents = {source: None}
+            frontier = deque([source])
+            while len(frontier) > 0 and sink not in parents:
+                node = frontier.popleft()
+                for neighbour in graph.neighbours(node):
+                    if neighbour not in parents and flow.get((node, neighbour), 0) < 1:
+                        parents[neighbour] = node
+                        frontier.append(neighbour)
 
-        for line in data:
-            root_node, other_nodes = line.split(": ")
-            other_nodes = [x for x in other_nodes.split(" ")]
-            connections = [(root_node, x) for x in other_nodes]
+            if sink not in parents:
+                return len(parents) if num_paths == WIRES_TO_CUT else None
 
-            for node in [root_node] + other_nodes:
-                graph.add_node(node)
+            node = sink
+            while parents[node] is not None:
+                prev_node = parents[node]
+                flow[(prev_node, node)] = flow.get((prev_node, node), 0) + 1
+                flow[(node, prev_node)] = flow.get((node, prev_node), 0) - 1
+                node = prev_node
+
+        return None  # More than WIRES_TO_CUT wires apart, so both are in the same group
+
+    def part1(self, data: List[str]) -> None:
+        """networkx totally trivialised this problem with its minimum cut, but
+        the same idea is only a few lines of max flow - keep one component
+        fixed and try the others until one is on the far side of a 3 wire cut.
+        """
+        with self.phase("parse"):
+            graph = Graph()
 
-            for connection in connections:
-                graph.add_edge(*connection, capacity=1)
+            for line in data:
+                root_node, other_nodes = line.split(": ")
+                for other_node in other_nodes.split(" "):
+                    graph.add_undirected_edge(root_node, other_node)
 
-        for node_pair in combinations(graph.nodes, 2):
-            min_cut, groups = nx.minimum_cut(graph, *node_pair)
-            if min_cut == 3:
-                group1, group2 = groups
-                return len(group1) * len(group2)
+        for sink in range(1, len(graph)):
+            group_size = self.__find_cut_group_size(graph, 0, sink)
+            if group_size is not None:
+                return group_size * (len(graph) - group_size)
 
     def part2(self, _data: List[str]) -> None:
         print("mery crimbas")
@@ -43,4 +67,4 @@ class Day25(Solver):
 
 def solve_day(day: int, use_sample: bool, run_each: List[bool]):
     solver = Day25(day, use_sample, run_each)
-    solver.solve()
+    return solver.solve()
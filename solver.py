@@ -1,11 +1,33 @@
 import argparse
+from contextlib import contextmanager
+import csv
+import functools
 import importlib
+import io
+import json
 import logging
+import mmap
+import operator
+import os
 from pathlib import Path
+import sys
 import time
-from typing import List, Callable
+import tracemalloc
+from typing import Any, List, Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
 
-from utils.data_loader import DataLoader
+from utils.answer_cache import AnswerCache, _to_json
+from utils.data_loader import DataLoader, MappedLines
+from utils.grid_utils import clear_grid_caches
+from utils.lazy_import import lazy_import
+from utils.memory import get_peak_rss_kib, reset_peak_rss
+
+# Only needed for some of the command line options, so keep them off the startup path
+cf = lazy_import("concurrent.futures")
+cProfile = lazy_import("cProfile")
+multiprocessing = lazy_import("multiprocessing")
+pstats = lazy_import("pstats")
+resource_tracker = lazy_import("multiprocessing.resource_tracker")
+subprocess = lazy_import("subprocess")
 
 _LOG_FORMATTER = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 _LOG = logging.getLogger(__name__)
@@ -16,14 +38,243 @@ _LOG_STREAM_HANDLER.setFormatter(_LOG_FORMATTER)
 _LOG.addHandler(_LOG_STREAM_HANDLER)
 _LOG.setLevel(logging.DEBUG)
 
+PROFILE_MODES = ["cprofile", "tracemalloc"]
+PROFILE_TOP_N = 40
+
+LINE_CHUNKS_PER_JOB = 4  # More chunks than workers, so one slow chunk does not hold up the rest
+MIN_PARALLEL_BYTES = 1 << 20  # Below this, starting the workers costs more than it saves
+MIN_PARALLEL_ITEMS = 100  # The same for map_items, unless the day knows its items are slow
+
+
+def _log_result(part_result: Dict) -> None:
+    time_ms = part_result["time_ns"] / 1e6
+    cached = " (cached)" if part_result.get("cached") else ""
+    _LOG.info(f"| Solved! Answer: {part_result['answer']} in {time_ms: 0.3f} ms!{cached}")
+    phases_ns = part_result["phases_ns"]
+    phase_breakdown = ", ".join(f"{k} {v / 1e6:0.3f} ms" for k, v in phases_ns.items())
+    _LOG.info(f"| Phases: {phase_breakdown} |")
+    if "peak_rss_kib" in part_result:
+        _LOG.info(
+            f"| Memory: peak RSS {part_result['peak_rss_kib'] / 1024:0.1f} MiB,"
+            f" peak traced {part_result['peak_traced_kib'] / 1024:0.1f} MiB |"
+        )
+    for name, stats in part_result.get("memo_stats", {}).items():
+        _LOG.info(
+            f"| Memo {name}: {stats['hits']} hits, {stats['misses']} misses,"
+            f" {stats['size']} kept, {stats['evictions']} evicted |"
+        )
+
+
+def artifact(method: Callable) -> Callable:
+    """Declare a `(self, data)` method as an artifact - something part 1
+    works out that part 2 also needs. The first call for an input runs the
+    method and later calls (from either part) reuse the result, so part 2 can
+    run on its own without relying on state left behind by part 1.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: "Solver", data: List[str]) -> Any:
+        return self.cache_parse(f"artifact:{method.__name__}", lambda: method(self, data))
+
+    return wrapper
+
 
 class Solver:
+    profile_mode = None  # One of PROFILE_MODES, set from the command line
+    track_memory = False  # Record peak RSS/traced memory per part, set from the command line
+    answer_cache = None  # AnswerCache to reuse answers from, set from the command line
+    refresh_cache = False  # Recompute (and overwrite) answers even if they are cached
+    # "lines" for List[str], "mmap" for a MappedLines, or "stream" for a one-shot Iterator[str]
+    input_mode = "lines"
+    map_jobs = None  # Processes for map_lines/map_items (None for all cores), from the command line
+
     def __init__(self, use_sample: bool, run_each: List[bool]) -> None:
         self.use_sample = use_sample
         self.my_base_path = __file__
         self.day = -1
         self.logger = _LOG
         self.run_part1, self.run_part2 = run_each
+        self._phases_ns = {}
+        self.input_hash = None
+        self._loaded_inputs = {}
+        self._parse_cache = {}
+        self._memo_caches = {}  # Filled in by @memoize methods, emptied after every part
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a block inside a part so it is reported separately, e.g.
+
+            with self.phase("parse"):
+                grid = NumpyArrayParser(data).parse()
+
+        Anything not inside a named phase is reported as "solve". Repeated
+        phases with the same name are summed.
+        """
+        start_time = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter_ns() - start_time
+            self._phases_ns[name] = self._phases_ns.get(name, 0) + elapsed
+
+    def cache_parse(self, name: str, parse: Callable[[], Any]) -> Any:
+        """Run a parse/preprocessing step once per input and share the result
+        between both parts, e.g.
+
+            grid = self.cache_parse("grid", lambda: NumpyArrayParser(data).parse())
+
+        This is keyed on the content hash of the input, so it is only reused
+        when both parts really read the same input. The result is shared, so
+        copy it before mutating anything.
+        """
+        key = (self.input_hash, name)
+        if key not in self._parse_cache:
+            self._parse_cache[key] = parse()
+        return self._parse_cache[key]
+
+    def map_lines(
+        self,
+        data: Any,
+        map_line: Callable[[str], Any],
+        reduce: Callable[[Any, Any], Any] = operator.add,
+        initial: Any = 0,
+    ) -> Any:
+        """Map every line on its own and reduce the results, e.g.
+
+            return self.map_lines(data, self.__score_line)  # Sum of each line's score
+
+        For big enough inputs in "mmap" mode, the file is split into chunks at
+        line boundaries and each worker process maps its chunks straight from
+        the file - only the byte range and the method's name are sent across,
+        never the input. map_line must be a method of this class (run on a
+        fresh instance in each worker, so it cannot rely on anything set up by
+        the part), reduce must be picklable, and initial must be its identity
+        (e.g. 0 for adding), as each chunk starts from it.
+        """
+        jobs = self.map_jobs or os.cpu_count()
+        if (
+            jobs > 1
+            and isinstance(data, MappedLines)
+            and data.path is not None
+            and len(data.buffer) >= MIN_PARALLEL_BYTES
+            and multiprocessing.parent_process() is None  # Never start pools inside a worker
+        ):
+            return self.__map_lines_parallel(data, map_line, reduce, initial, jobs)
+
+        return _reduce_lines(data, map_line, reduce, initial)
+
+    def __map_lines_parallel(
+        self,
+        data: MappedLines,
+        map_line: Callable[[str], Any],
+        reduce: Callable[[Any, Any], Any],
+        initial: Any,
+        jobs: int,
+    ) -> Any:
+        size = len(data.buffer)
+        num_chunks = jobs * LINE_CHUNKS_PER_JOB
+        bounds = [0]
+        for chunk_idx in range(1, num_chunks):
+            split = data.source.find(b"\n", max(size * chunk_idx // num_chunks, bounds[-1]))
+            if split == -1:
+                break
+            bounds.append(split + 1)
+        bounds.append(size)
+
+        method_name = _method_name(self, map_line)
+        with cf.ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(
+                    _map_line_chunk,
+                    type(self),
+                    self.day,
+                    method_name,
+                    data.path,
+                    (start, stop),
+                    reduce,
+                    initial,
+                )
+                for start, stop in zip(bounds, bounds[1:])
+                if start < stop
+            ]
+            result = initial
+            for future in futures:  # In order, so reduce only needs to be associative
+                result = reduce(result, future.result())
+        return result
+
+    def map_items(
+        self,
+        map_item: Callable[..., Any],
+        items: List[Tuple],
+        reduce: Callable[[Any, Any], Any] = operator.add,
+        initial: Any = 0,
+        min_items: int = MIN_PARALLEL_ITEMS,
+    ) -> Any:
+        """Like map_lines, but for any independent pieces of work: map_item is
+        called with the arguments in each item, and the results reduced. The
+        items are shared out to worker processes in chunks, so they should be
+        cheap to pickle - pass big arrays as a SharedGrid (utils.shared_grid)
+        rather than in every item. The same rules as map_lines apply to
+        map_item, reduce and initial.
+
+        With fewer than min_items items they are run here instead, as starting
+        the workers would take longer - lower it if each item is slow.
+        """
+        jobs = self.map_jobs or os.cpu_count()
+        if (
+            jobs <= 1
+            or len(items) < max(min_items, 2)
+            or multiprocessing.parent_process() is not None  # Never start pools inside a worker
+        ):
+            result = initial
+            for item in items:
+                result = reduce(result, map_item(*item))
+            return result
+
+        method_name = _method_name(self, map_item)
+        chunk_size = -(-len(items) // (jobs * LINE_CHUNKS_PER_JOB))
+        if os.name == "posix":
+            # Items can share memory with the workers once they are sent (see
+            # utils.shared_grid) - starting the resource tracker first means the
+            # workers use this process's one, rather than each starting their own
+            # that would clean that memory up when the worker exits
+            resource_tracker.ensure_running()
+        with cf.ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(
+                    _map_item_chunk,
+                    type(self),
+                    self.day,
+                    method_name,
+                    items[idx : idx + chunk_size],
+                    reduce,
+                    initial,
+                )
+                for idx in range(0, len(items), chunk_size)
+            ]
+            result = initial
+            for future in futures:
+                result = reduce(result, future.result())
+        return result
+
+    def _pop_memo_stats(self) -> Dict[str, Dict[str, int]]:
+        """Stats for every @memoize method used this part, dropping their
+        results so they do not hold on to memory between parts and inputs
+        """
+        memo_stats = {name: memo.stats() for name, memo in self._memo_caches.items()}
+        self._memo_caches = {}
+        return memo_stats
+
+    def read_input(self, data_loader: DataLoader) -> Any:
+        """Load the input in whichever form this day works on. Streamed input
+        is read as the part consumes it, so for those days reading the file is
+        counted as part of the solve rather than the load.
+        """
+        if self.input_mode == "mmap":
+            return data_loader.load_mapped()
+        if self.input_mode == "stream":
+            return data_loader.iter_lines()
+        return data_loader.load_data()
 
     def part1(self, data: List) -> None:
         raise NotImplementedError("Implement this method in a child class!")
@@ -31,9 +282,7 @@ class Solver:
     def part2(self, data: List) -> None:
         raise NotImplementedError("Implement this method in a child class!")
 
-    def _solve(self, solver: Callable, part: int, use_sample: bool) -> None:
-        start_time = time.time()
-        _LOG.info(f"| Part {part} | File I/O |")
+    def __find_input(self, part: int, use_sample: bool) -> Path:
         if use_sample:
             target_file = Path(self.my_base_path).parent / f"p{part}_sample.txt"
             alt_file = Path(self.my_base_path).parent / f"sample.txt"
@@ -46,30 +295,552 @@ class Solver:
                 target_file = alt_file  # Used when the input does not change from part 1 to 2
             else:
                 raise FileNotFoundError("Could not find a suitable input!")
+        return target_file
+
+    def __run_profiled(self, solver: Callable, data: List[str], part: int) -> Any:
+        """Only the part itself is profiled (not the file I/O). Output goes next
+        to the day as profile_pN.prof (for snakeviz/flameprof) and a sorted text
+        summary in profile_pN.txt.
+        """
+        output_base = Path(self.my_base_path).parent / f"profile_p{part}"
 
-        data = DataLoader(target_file).load_data()
+        if self.profile_mode == "cprofile":
+            profiler = cProfile.Profile()
+            result = profiler.runcall(solver, data)
+            profiler.dump_stats(output_base.with_suffix(".prof"))
+            with open(output_base.with_suffix(".txt"), "w") as f:
+                stats = pstats.Stats(profiler, stream=f)
+                stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_TOP_N)
+
+        elif self.profile_mode == "tracemalloc":
+            already_tracing = tracemalloc.is_tracing()  # i.e. track_memory is on
+            tracemalloc.start()
+            try:
+                result = solver(data)
+                snapshot = tracemalloc.take_snapshot()
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                if not already_tracing:
+                    tracemalloc.stop()
+            with open(output_base.with_suffix(".txt"), "w") as f:
+                f.write(f"Peak traced memory: {peak / 1024:0.1f} KiB\n")
+                f.write(f"Top {PROFILE_TOP_N} allocation sites live at the end of the part:\n")
+                for stat in snapshot.statistics("lineno")[:PROFILE_TOP_N]:
+                    f.write(f"{stat}\n")
+
+        else:
+            raise ValueError(f"Unknown profile mode {self.profile_mode}, use {PROFILE_MODES}")
+
+        _LOG.info(f"| Part {part} | Profile written to {output_base}.* |")
+        return result
+
+    def __get_cached_result(self, part: int) -> Optional[Dict]:
+        if self.answer_cache is None or self.refresh_cache:
+            return None
+
+        cached_result = self.answer_cache.get(self.day, part, self.input_hash, self.my_base_path)
+        if cached_result is not None:
+            cached_result["cached"] = True
+        return cached_result
+
+    def _solve(
+        self,
+        solver: Callable,
+        part: int,
+        use_sample: bool,
+        data_loader: Optional[DataLoader] = None,
+    ) -> Dict:
+        """Solve one part, on the day's own input file unless a data_loader is
+        given (for a specific file or for text already in memory)
+        """
+        if self.track_memory:
+            reset_peak_rss()
+            tracemalloc.start()
+            tracemalloc.reset_peak()
+        try:
+            return self.__solve_part(solver, part, use_sample, data_loader)
+        finally:
+            if self.track_memory:
+                tracemalloc.stop()  # However the part ended, so later parts are not traced
+
+    def __solve_part(
+        self,
+        solver: Callable,
+        part: int,
+        use_sample: bool,
+        data_loader: Optional[DataLoader],
+    ) -> Dict:
+        self._phases_ns = {}
+        self._memo_caches = {}
+        start_time = time.perf_counter_ns()
+        _LOG.info(f"| Part {part} | File I/O |")
+        with self.phase("load"):
+            if data_loader is None:
+                data_loader = DataLoader(self.__find_input(part, use_sample))
+            self.input_hash = data_loader.get_hash()
+
+        cached_result = self.__get_cached_result(part)
+        if cached_result is not None:
+            _log_result(cached_result)
+            return cached_result
+
+        with self.phase("load"):
+            if self.input_mode == "stream":
+                data = self.read_input(data_loader)  # Can only be used once, so never shared
+            else:
+                if self.input_hash not in self._loaded_inputs:
+                    self._loaded_inputs[self.input_hash] = self.read_input(data_loader)
+                data = self._loaded_inputs[self.input_hash]
 
         _LOG.info(f"| Part {part} | Solving |")
-        result = solver(data)
-        end_time = time.time()
-        _LOG.info(f"| Solved! Answer: {result} in {(end_time-start_time) * 1000: 0.3f} ms!")
+        solve_start_time = time.perf_counter_ns()
+        try:
+            if self.profile_mode is None:
+                result = solver(data)
+            else:
+                result = self.__run_profiled(solver, data, part)
+        finally:
+            end_time = time.perf_counter_ns()
+            memo_stats = self._pop_memo_stats()
+            clear_grid_caches()
 
-    def solve(self):
+        # Whatever the day did not mark as its own phase is the algorithm itself
+        marked_ns = sum(v for k, v in self._phases_ns.items() if k != "load")
+        self._phases_ns["solve"] = end_time - solve_start_time - marked_ns
+
+        part_result = {
+            "day": self.day,
+            "part": part,
+            "answer": result,
+            "time_ns": end_time - start_time,
+            "phases_ns": self._phases_ns,
+        }
+        if memo_stats:
+            part_result["memo_stats"] = memo_stats
+        if self.track_memory:
+            _, peak_traced = tracemalloc.get_traced_memory()
+            part_result["peak_rss_kib"] = get_peak_rss_kib()
+            part_result["peak_traced_kib"] = peak_traced // 1024
+        if self.answer_cache is not None:
+            self.answer_cache.put(self.day, part, self.input_hash, self.my_base_path, part_result)
+        _log_result(part_result)
+        return part_result
+
+    def solve_data(self, part: int, data: List[str]) -> Dict:
+        """Solve a part on lines already in memory - no input files, answer
+        cache, profiling or logging, just the answer and how long it took
+        """
+        self._phases_ns = {}
+        self._memo_caches = {}
+        part_solver = self.part1 if part == 1 else self.part2
+
+        start_time = time.perf_counter_ns()
+        try:
+            result = part_solver(data)
+        finally:
+            end_time = time.perf_counter_ns()
+            memo_stats = self._pop_memo_stats()
+            clear_grid_caches()
+
+        self._phases_ns["solve"] = end_time - start_time - sum(self._phases_ns.values())
+        part_result = {
+            "day": self.day,
+            "part": part,
+            "answer": result,
+            "time_ns": end_time - start_time,
+            "phases_ns": self._phases_ns,
+        }
+        if memo_stats:
+            part_result["memo_stats"] = memo_stats
+        return part_result
+
+    def solve(self) -> List[Dict]:
         _LOG.info(f"| =------= DAY {self.day:02d} =------= |")
+        results = []
         if self.run_part1:
-            self._solve(self.part1, 1, self.use_sample)
+            results.append(self._solve(self.part1, 1, self.use_sample))
         if self.run_part2:
-            self._solve(self.part2, 2, self.use_sample)
+            results.append(self._solve(self.part2, 2, self.use_sample))
         _LOG.info(f"| =-----= COMPLETE =-----= |")
+        return results
 
 
-if __name__ == "__main__":
+def get_day_solver(day: int) -> type:
+    """Import a day and return its Solver subclass (always named DayNN)"""
+    day_solver = importlib.import_module(f"days.day{day:02d}.solve_day")
+    return getattr(day_solver, f"Day{day:02d}")
+
+
+def solve(day: int, part: int, data: Union[str, bytes, Iterable[str]]) -> Dict:
+    """Library entry point: solve one part of a day on the given input, which
+    can be the whole text (str or bytes) or an iterable of lines. Nothing is
+    read from disk or logged, e.g.
+
+        from solver import solve
+        solve(1, 2, "two1nine\neightwothree\n")["answer"]
+
+    Each call gets a fresh solver, so nothing is shared between calls.
+    """
+    if part not in [1, 2]:
+        raise ValueError(f"Part must be 1 or 2, not {part}")
+
+    day_solver = get_day_solver(day)(day, False, [part == 1, part == 2])
+
+    if day_solver.input_mode == "mmap":
+        if isinstance(data, str):
+            data = data.encode()
+        elif not isinstance(data, bytes):
+            data = "\n".join(line.rstrip("\r\n") for line in data).encode()
+        return day_solver.solve_data(part, MappedLines(data))
+
+    if day_solver.input_mode == "stream":
+        if isinstance(data, bytes):
+            data = data.decode()
+        if isinstance(data, str):
+            data = io.StringIO(data)
+        return day_solver.solve_data(part, (line.rstrip("\r\n") for line in data))
+
+    if isinstance(data, bytes):
+        data = data.decode()
+    if isinstance(data, str):
+        lines = data.splitlines()
+    else:
+        lines = [line.rstrip("\r\n") for line in data]
+    return day_solver.solve_data(part, lines)
+
+
+def _reduce_lines(
+    lines: Iterable[Union[str, memoryview]],
+    map_line: Callable[[str], Any],
+    reduce: Callable[[Any, Any], Any],
+    initial: Any,
+) -> Any:
+    result = initial
+    for line in lines:
+        if isinstance(line, memoryview):
+            line = str(line, "utf-8")
+        result = reduce(result, map_line(line))
+    return result
+
+
+def _method_name(day_solver: Solver, method: Callable) -> str:
+    """Attribute name of a bound method on its class (as mangled for __private
+    methods), so a worker can look the same method up on its own instance
+    """
+    if getattr(method, "__self__", None) is day_solver:
+        for cls in type(day_solver).__mro__:
+            for name, value in vars(cls).items():
+                if value is method.__func__:
+                    return name
+    raise ValueError(
+        f"map_lines/map_items can only send a method of the solver to workers, not {method}"
+    )
+
+
+_WORKER_SOLVERS = {}  # Solver for each day class, kept by each map_lines/map_items worker
+
+
+def _get_worker_solver(day_class: type, day: int) -> Solver:
+    if day_class not in _WORKER_SOLVERS:
+        _WORKER_SOLVERS[day_class] = day_class(day, False, [True, True])
+    return _WORKER_SOLVERS[day_class]
+
+
+def _map_line_chunk(
+    day_class: type,
+    day: int,
+    method_name: str,
+    path: Path,
+    chunk: Tuple[int, int],
+    reduce: Callable[[Any, Any], Any],
+    initial: Any,
+) -> Any:
+    """Worker side of Solver.map_lines - map the lines in one byte range of the
+    file (which always starts at the beginning of a line)
+    """
+    day_solver = _get_worker_solver(day_class, day)
+    map_line = getattr(day_solver, method_name)
+
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    try:
+        # Split the same way as a serial run, so both give the same lines
+        result = _reduce_lines(MappedLines(mapped, path).lines(*chunk), map_line, reduce, initial)
+    finally:
+        day_solver._pop_memo_stats()  # Memos only last for the chunk
+    mapped.close()  # Only once the lines (views into it) are gone
+    return result
+
+
+def _map_item_chunk(
+    day_class: type,
+    day: int,
+    method_name: str,
+    items: List[Tuple],
+    reduce: Callable[[Any, Any], Any],
+    initial: Any,
+) -> Any:
+    """Worker side of Solver.map_items"""
+    day_solver = _get_worker_solver(day_class, day)
+    map_item = getattr(day_solver, method_name)
+
+    result = initial
+    try:
+        for item in items:
+            result = reduce(result, map_item(*item))
+    finally:
+        day_solver._pop_memo_stats()
+    return result
+
+
+def _run_in_worker(day: int, use_sample: bool, run_each: List[bool]) -> List[Dict]:
+    """Entry point for each process in the pool. Logging is quietened so that
+    the parent can report everything in day order once the results are back.
+    """
+    _LOG.setLevel(logging.WARNING)
+    day_solver = importlib.import_module(f"days.day{day:02d}.solve_day")
+    return day_solver.solve_day(day, use_sample, run_each)
+
+
+def solve_parallel(days: List[int], use_sample: bool, run_each: List[bool], jobs: int) -> None:
+    """Dispatch each day and part to a process pool, so the full run is
+    bounded by the slowest single part rather than the sum of all of them.
+    """
+    pending = {}
+    with cf.ProcessPoolExecutor(max_workers=jobs) as executor:
+        for day in days:
+            try:
+                get_day_solver(day)
+            except ImportError:
+                pending[day] = None
+                continue
+
+            part_splits = [[idx == part for idx in range(2)] for part in range(2)]
+            part_splits = [x for x, run in zip(part_splits, run_each) if run]
+
+            pending[day] = [
+                executor.submit(_run_in_worker, day, use_sample, x) for x in part_splits
+            ]
+
+        for day, futures in pending.items():
+            if futures is None:
+                _LOG.error(f"!!! DAY {day:02d} NOT IMPLEMENTED YET !!!")
+                continue
+
+            _LOG.info(f"| =------= DAY {day:02d} =------= |")
+            for future in futures:
+                try:
+                    part_results = future.result()
+                except Exception as e:
+                    _LOG.error(f"!!! DAY {day:02d} FAILED: {e!r} !!!")
+                    continue
+                for part_result in part_results:
+                    _LOG.info(f"| Part {part_result['part']} |")
+                    _log_result(part_result)
+            _LOG.info("| =-----= COMPLETE =-----= |")
+
+
+def _solve_input(day: int, input_path: Path, run_each: List[bool]) -> List[Dict]:
+    """Solve the selected parts of one day for one input file, recording any
+    failure against the input rather than giving up on the whole batch
+    """
+    _LOG.setLevel(logging.WARNING)
+    day_solver = get_day_solver(day)(day, False, run_each)
+    data_loader = DataLoader(input_path)
+
+    results = []
+    for part, run in zip([1, 2], run_each):
+        if not run:
+            continue
+        part_solver = getattr(day_solver, f"part{part}")
+        try:
+            part_result = day_solver._solve(part_solver, part, False, data_loader)
+        except Exception as e:
+            part_result = {"day": day, "part": part, "answer": None, "error": repr(e)}
+        results.append({"input": input_path.name, **part_result})
+    return results
+
+
+def solve_batch(day: int, input_dir: Path, run_each: List[bool], jobs: int) -> List[Dict]:
+    """Solve one day for every file in a directory, fanned out over a pool of
+    processes. Each worker only imports the day once, and both parts of an
+    input share its loaded lines and cached parses.
+    """
+    input_paths = sorted(x for x in Path(input_dir).iterdir() if x.is_file())
+    if len(input_paths) == 0:
+        raise FileNotFoundError(f"No inputs found in {input_dir}")
+    get_day_solver(day)  # Fail early (and in this process) if the day does not exist
+
+    if jobs > 1:
+        with cf.ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(_solve_input, day, x, run_each) for x in input_paths]
+            batch_results = [future.result() for future in futures]
+    else:
+        log_level = _LOG.level
+        try:
+            batch_results = [_solve_input(day, x, run_each) for x in input_paths]
+        finally:
+            _LOG.setLevel(log_level)
+
+    results = [part_result for input_results in batch_results for part_result in input_results]
+    for part_result in results:
+        if "error" in part_result:
+            _LOG.error(
+                f"| {part_result['input']} | Part {part_result['part']} | "
+                f"FAILED: {part_result['error']} |"
+            )
+        else:
+            time_ms = part_result["time_ns"] / 1e6
+            _LOG.info(
+                f"| {part_result['input']} | Part {part_result['part']} | "
+                f"Answer: {part_result['answer']} in {time_ms:0.3f} ms |"
+            )
+    return results
+
+
+def write_batch_results(results: List[Dict], output_path: Optional[Path]) -> None:
+    """JSON if the output ends in .json, otherwise CSV (to stdout if no output
+    path is given) with one column per phase
+    """
+    if output_path is not None and output_path.suffix == ".json":
+        with open(output_path, "w") as f:
+            json.dump(results, f, indent=2, default=_to_json)
+        return
+
+    phase_names = []
+    for part_result in results:
+        for name in part_result.get("phases_ns", {}):
+            if name not in phase_names:
+                phase_names.append(name)
+
+    rows = []
+    for part_result in results:
+        row = {k: part_result.get(k, "") for k in ["input", "day", "part", "answer"]}
+        if "time_ns" in part_result:
+            row["time_ms"] = part_result["time_ns"] / 1e6
+            for name in phase_names:
+                row[f"{name}_ms"] = part_result["phases_ns"].get(name, 0) / 1e6
+        row["cached"] = part_result.get("cached", False)
+        row["error"] = part_result.get("error", "")
+        rows.append(row)
+
+    fields = ["input", "day", "part", "answer", "time_ms"]
+    fields += [f"{name}_ms" for name in phase_names] + ["cached", "error"]
+    f = sys.stdout if output_path is None else open(output_path, "w", newline="")
+    try:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+    finally:
+        if f is not sys.stdout:
+            f.close()
+
+
+def _import_times_us(import_statement: str) -> Dict[str, int]:
+    """Run the statement in a fresh interpreter under `-X importtime` and total
+    the self time of every module by its top level package
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", import_statement],
+        cwd=Path(__file__).parent,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise ImportError(proc.stderr.strip().splitlines()[-1])
+
+    package_us = {}
+    for line in proc.stderr.splitlines():
+        # Lines look like "import time:       123 |       456 |   numpy.core"
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, _, module_name = line[len("import time:") :].split("|")
+        package = module_name.strip().split(".")[0]
+        package_us[package] = package_us.get(package, 0) + int(self_us)
+    return package_us
+
+
+def report_import_times(days: List[int], top_n: int = 5) -> None:
+    """Log how long importing each day takes, and which packages that time goes
+    on. Interpreter startup is measured separately and taken off, and anything
+    loaded with lazy_import only counts once a part actually uses it.
+    """
+    startup_us = _import_times_us("pass")
+    for day in days:
+        try:
+            package_us = _import_times_us(f"import days.day{day:02d}.solve_day")
+        except ImportError as e:
+            _LOG.error(f"!!! DAY {day:02d} FAILED TO IMPORT: {e} !!!")
+            continue
+
+        for package, us in startup_us.items():
+            package_us[package] = package_us.get(package, 0) - us
+        package_us = {k: v for k, v in package_us.items() if v > 0}
+
+        total_ms = sum(package_us.values()) / 1e3
+        heaviest = sorted(package_us.items(), key=lambda x: x[1], reverse=True)[:top_n]
+        breakdown = ", ".join(f"{k} {v / 1e3:0.1f} ms" for k, v in heaviest)
+        _LOG.info(f"| Day {day:02d} imports in {total_ms:0.1f} ms | {breakdown} |")
+
+
+def main() -> None:
     args = argparse.ArgumentParser()
     args.add_argument("d", type=int, help="Day to run (integer)")
     args.add_argument("-s", action="store_true", help="Run with sample input")
     args.add_argument("-a", action="store_true", help="Run all days")
     args.add_argument("-o1", action="store_true", help="Only run day 1")
     args.add_argument("-o2", action="store_true", help="Only run day 2")
+    args.add_argument(
+        "--jobs",
+        type=int,
+        nargs="?",
+        default=1,
+        const=os.cpu_count(),
+        help="Solve days/parts across a pool of N processes (defaults to all cores)",
+    )
+    args.add_argument(
+        "--map-jobs",
+        type=int,
+        help="Processes for days that share out independent lines/items (default all cores)",
+    )
+    args.add_argument(
+        "--profile",
+        nargs="?",
+        const="cprofile",
+        choices=PROFILE_MODES,
+        help="Profile each part, writing days/dayNN/profile_pN.* (defaults to cprofile)",
+    )
+    args.add_argument(
+        "--memory",
+        action="store_true",
+        help="Report peak RSS and traced allocations per part (tracing slows the run down)",
+    )
+    args.add_argument(
+        "--cache",
+        type=Path,
+        nargs="?",
+        const=Path(".answer_cache"),
+        help="Reuse answers for unchanged days/inputs from this directory (default .answer_cache)",
+    )
+    args.add_argument(
+        "--no-cache", action="store_true", help="Recompute every answer (refreshing the cache)"
+    )
+    args.add_argument(
+        "--inputs",
+        type=Path,
+        help="Solve day d for every input file in this directory (use --jobs to fan out)",
+    )
+    args.add_argument(
+        "--output",
+        type=Path,
+        help="Where to write the --inputs results (.json for JSON, otherwise CSV; default stdout)",
+    )
+    args.add_argument(
+        "--import-times",
+        action="store_true",
+        help="Report how long each day takes to import (and on what) instead of solving",
+    )
 
     opts = args.parse_args()
     if opts.o1 and opts.o2:
@@ -79,14 +850,40 @@ if __name__ == "__main__":
     if not any(run_each):
         run_each = [True, True]
 
+    Solver.profile_mode = opts.profile
+    Solver.map_jobs = opts.map_jobs
+    Solver.track_memory = opts.memory
+    if opts.cache is not None:
+        Solver.answer_cache = AnswerCache(opts.cache)
+    Solver.refresh_cache = opts.no_cache
+
     if opts.a:
         days = range(1, 26)
     else:
         days = [opts.d]
 
-    for day in days:
+    if opts.import_times:
+        report_import_times(days)
+    elif opts.inputs is not None:
         try:
-            day_solver = importlib.import_module(f"days.day{day:02d}.solve_day")
-            day_solver.solve_day(day, opts.s, run_each)
+            results = solve_batch(opts.d, opts.inputs, run_each, opts.jobs)
         except ImportError:
-            _LOG.error(f"!!! DAY {day:02d} NOT IMPLEMENTED YET !!!")
+            _LOG.error(f"!!! DAY {opts.d:02d} NOT IMPLEMENTED YET !!!")
+            return
+        write_batch_results(results, opts.output)
+    elif opts.jobs > 1:
+        solve_parallel(days, opts.s, run_each, opts.jobs)
+    else:
+        for day in days:
+            try:
+                day_solver = importlib.import_module(f"days.day{day:02d}.solve_day")
+                day_solver.solve_day(day, opts.s, run_each)
+            except ImportError:
+                _LOG.error(f"!!! DAY {day:02d} NOT IMPLEMENTED YET !!!")
+
+
+if __name__ == "__main__":
+    # The days import this file as `solver`, so run from that module to share its logger
+    import solver
+
+    solver.main()
@@ -0,0 +1,60 @@
+# Day 10 against the puzzle's own samples, since the loop search once kept
+# going past a closed loop and answered 0
+
+import pytest
+
+from solver import solve
+
+SQUARE_LOOP = """\
+..F7.
+.FJ|.
+SJ.L7
+|F--J
+LJ...
+"""
+
+SQUEEZED_LOOP = """\
+...........
+.S-------7.
+.|F-----7|.
+.||.....||.
+.||.....||.
+.|L-7.F-J|.
+.|..|.|..|.
+.L--J.L--J.
+...........
+"""
+
+LARGER_LOOP = """\
+.F----7F7F7F7F-7....
+.|F--7||||||||FJ....
+.||.FJ||||||||L7....
+FJL7L7LJLJ||LJ.L-7..
+L--J.L7...LJS7F-7L7.
+....F-J..F7FJ|L7L7L7
+....L7.F7||L7|.L7L7|
+.....|FJLJ|FJ|F7|.LJ
+....FJL-7.||.||||...
+....L---J.LJ.LJLJ...
+"""
+
+
+@pytest.mark.parametrize(
+    "sample, part, answer",
+    [
+        (SQUARE_LOOP, 1, 8),
+        (SQUARE_LOOP, 2, 1),
+        (SQUEEZED_LOOP, 1, 23),
+        (SQUEEZED_LOOP, 2, 4),
+        (LARGER_LOOP, 1, 70),
+        (LARGER_LOOP, 2, 8),
+    ],
+    ids=["square-p1", "square-p2", "squeezed-p1", "squeezed-p2", "larger-p1", "larger-p2"],
+)
+def test_day10_samples(sample: str, part: int, answer: int) -> None:
+    assert solve(10, part, sample)["answer"] == answer
+
+
+def test_day10_no_loop() -> None:
+    with pytest.raises(ValueError, match="No loop through S"):
+        solve(10, 1, ".....\n.S-..\n.....\n")
@@ -0,0 +1,73 @@
+# On-disk cache of answers, so unchanged days do not need to be recomputed
+
+import ast
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+UTILS_DIRECTORY = Path(__file__).parent
+
+
+def _find_utils_imports(source_file: Path) -> List[Path]:
+    """Find every utils module that a file imports (including the utils modules
+    those import in turn), so that editing a shared helper invalidates the
+    days that rely on it.
+    """
+    found = []
+    to_check = [source_file]
+    while len(to_check) > 0:
+        tree = ast.parse(to_check.pop().read_text())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                module_names = [x.name for x in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module is not None:
+                module_names = [node.module] + [f"{node.module}.{x.name}" for x in node.names]
+            else:
+                continue
+
+            for module_name in module_names:
+                if not module_name.startswith("utils."):
+                    continue
+                module_file = UTILS_DIRECTORY / f"{module_name.split('.')[1]}.py"
+                if module_file.exists() and module_file not in found:
+                    found.append(module_file)
+                    to_check.append(module_file)
+    return sorted(found)
+
+
+def _to_json(obj: object) -> object:
+    # numpy scalars turn up as answers quite often
+    return obj.item() if hasattr(obj, "item") else str(obj)
+
+
+class AnswerCache:
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._source_hashes = {}
+
+    def get_source_hash(self, day_file: Path) -> str:
+        day_file = Path(day_file)
+        if day_file not in self._source_hashes:
+            source_hash = hashlib.sha256()
+            for source_file in [day_file] + _find_utils_imports(day_file):
+                source_hash.update(source_file.read_bytes())
+            self._source_hashes[day_file] = source_hash.hexdigest()
+        return self._source_hashes[day_file]
+
+    def __entry_path(self, day: int, part: int, input_hash: str, day_file: Path) -> Path:
+        key = hashlib.sha256(f"{input_hash}{self.get_source_hash(day_file)}".encode())
+        return self.cache_dir / f"day{day:02d}_p{part}_{key.hexdigest()[:32]}.json"
+
+    def get(self, day: int, part: int, input_hash: str, day_file: Path) -> Optional[Dict]:
+        entry_path = self.__entry_path(day, part, input_hash, day_file)
+        if not entry_path.exists():
+            return None
+        with open(entry_path, "r") as f:
+            return json.load(f)
+
+    def put(self, day: int, part: int, input_hash: str, day_file: Path, result: Dict) -> None:
+        entry_path = self.__entry_path(day, part, input_hash, day_file)
+        with open(entry_path, "w") as f:
+            json.dump(result, f, default=_to_json)
@@ -0,0 +1,123 @@
+# Cycle detection for simulations that eventually repeat themselves
+
+from typing import Any, Callable, Hashable, List, Optional
+
+
+class Cycle:
+    """Where a sequence of states x0, step(x0), step(step(x0)), ... starts
+    repeating: step `offset` is the first state on the loop, and the loop is
+    `period` steps long. state_at can then jump to any step, however far.
+    """
+
+    def __init__(
+        self,
+        offset: int,
+        period: int,
+        step: Callable[[Any], Any],
+        initial: Any,
+        states: Optional[List[Any]] = None,
+        cycle_start: Any = None,
+    ) -> None:
+        self.offset = offset
+        self.period = period
+        self.__step = step
+        self.__initial = initial
+        self.__states = states  # Every state up to the end of the first loop, if kept
+        self.__cycle_start = cycle_start
+
+    def __repr__(self) -> str:
+        return f"Cycle(offset={self.offset}, period={self.period})"
+
+    def index_at(self, target_step: int) -> int:
+        """The step before the end of the first loop that matches target_step"""
+        if target_step < self.offset:
+            return target_step
+        return self.offset + (target_step - self.offset) % self.period
+
+    def state_at(self, target_step: int) -> Any:
+        idx = self.index_at(target_step)
+        if self.__states is not None:
+            return self.__states[idx]
+
+        # Low memory mode - step forward from the nearest state we do have
+        if idx < self.offset:
+            state, steps = self.__initial, idx
+        else:
+            state, steps = self.__cycle_start, idx - self.offset
+        for _ in range(steps):
+            state = self.__step(state)
+        return state
+
+
+def _identity(state: Any) -> Hashable:
+    return state
+
+
+def find_cycle(
+    initial: Any,
+    step: Callable[[Any], Any],
+    key: Callable[[Any], Hashable] = _identity,
+) -> Cycle:
+    """Step until a state repeats, remembering the step each state was first
+    seen at. Takes offset + period steps and keeps every state, so state_at
+    is just a lookup.
+
+    Args:
+        initial (Any): state at step 0
+        step (Callable): returns the next state - must not modify its argument
+        key (Callable): hashable fingerprint of a state (e.g. arr.tobytes()
+            for numpy arrays), which must be equal only for equal states
+
+    Returns:
+        Cycle: offset and period of the loop
+    """
+    first_seen = {}
+    states = []
+    state = initial
+    while True:
+        state_key = key(state)
+        if state_key in first_seen:
+            offset = first_seen[state_key]
+            return Cycle(offset, len(states) - offset, step, initial, states=states)
+        first_seen[state_key] = len(states)
+        states.append(state)
+        state = step(state)
+
+
+def find_cycle_brent(
+    initial: Any,
+    step: Callable[[Any], Any],
+    key: Callable[[Any], Hashable] = _identity,
+) -> Cycle:
+    """Brent's algorithm, for when the states are too big to keep all of them.
+    Only a couple of states are held at once, at the cost of stepping roughly
+    2 * (offset + period) times, and state_at has to step forward (at most a
+    period, or up to the offset for steps before the loop).
+
+    Args are the same as for find_cycle.
+    """
+    # Find the period - the hare runs ahead, and the tortoise teleports to it
+    # at each power of two until the hare laps back round onto it
+    power = period = 1
+    tortoise, hare = initial, step(initial)
+    tortoise_key, hare_key = key(tortoise), key(hare)
+    while tortoise_key != hare_key:
+        if power == period:
+            tortoise, tortoise_key = hare, hare_key
+            power *= 2
+            period = 0
+        hare = step(hare)
+        hare_key = key(hare)
+        period += 1
+
+    # Then find the offset - with the hare a period ahead, they meet on the
+    # first state of the loop
+    tortoise = hare = initial
+    for _ in range(period):
+        hare = step(hare)
+    offset = 0
+    while key(tortoise) != key(hare):
+        tortoise, hare = step(tortoise), step(hare)
+        offset += 1
+
+    return Cycle(offset, period, step, initial, cycle_start=tortoise)
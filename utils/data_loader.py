@@ -1,15 +1,116 @@
 # Example for relative common import
 
-from typing import List
+import hashlib
+import io
+import mmap
+from pathlib import Path
+from typing import Iterator, List, Optional, Union
+
+CR = ord("\r")  # Dropped from the end of lines, so CRLF files read the same as LF ones
+
+
+class MappedLines:
+    """Read-only view of an input as bytes, for days that can work on bytes
+    instead of a list of str (set `input_mode = "mmap"` on the Solver).
+    Iterating gives each line (without the \\n or \\r\\n) as a memoryview slice
+    of the buffer, so nothing is copied - call bytes() on a line if you need
+    to keep it around. Regexes (compiled from bytes) can also run over the
+    whole `buffer` at once.
+
+    `path` is the file that was mapped (None for input already in memory), so
+    other processes can map the same file rather than be sent its contents.
+    """
+
+    def __init__(self, source: Union[mmap.mmap, bytes], path: Optional[Path] = None) -> None:
+        self.source = source
+        self.buffer = memoryview(source)
+        self.path = path
+
+    def __iter__(self) -> Iterator[memoryview]:
+        return self.lines()
+
+    def lines(self, start: int = 0, stop: Optional[int] = None) -> Iterator[memoryview]:
+        """Lines in the byte range start to stop, where start is the beginning
+        of a line (e.g. just after a newline)
+        """
+        stop = len(self.buffer) if stop is None else stop
+        while start < stop:
+            end = self.source.find(b"\n", start, stop)
+            if end == -1:
+                end = stop  # Last line without a trailing newline
+            line_end = end - 1 if end > start and self.source[end - 1] == CR else end
+            yield self.buffer[start:line_end]
+            start = end + 1
 
 
 class DataLoader:
     def __init__(self, file_path) -> None:
         self.file_path = file_path
 
+    def get_hash(self) -> str:
+        """sha256 of the file contents, used to tell when two parts (or two
+        runs) are reading the same input regardless of the file name
+        """
+        file_hash = hashlib.sha256()
+        with open(self.file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                file_hash.update(chunk)
+        return file_hash.hexdigest()
+
     def load_data(self) -> List:
         with open(self.file_path, "r") as f:
             lines = [x.strip("\n") for x in f.readlines()]
 
         assert len(lines) > 0, f"Did not load any data from {self.file_path} - check the file"
         return lines
+
+    def iter_lines(self) -> Iterator[str]:
+        """Same lines as load_data, but read one at a time as they are asked
+        for, so only the current line is ever held in memory
+        """
+        with open(self.file_path, "r") as f:
+            yield from self._iter_stripped(f, str(self.file_path))
+
+    def _iter_stripped(self, lines: Iterator[str], source: str) -> Iterator[str]:
+        any_lines = False
+        for line in lines:
+            any_lines = True
+            yield line.strip("\n")
+        assert any_lines, f"Did not load any data from {source} - check the file"
+
+    def load_mapped(self) -> MappedLines:
+        """Memory map the file rather than reading it in, so even very large
+        inputs are only paged in as they are used (and never held as str)
+        """
+        with open(self.file_path, "rb") as f:
+            # mmap refuses empty files, which is as good a check as any
+            assert f.seek(0, 2) > 0, f"Did not load any data from {self.file_path} - check the file"
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return MappedLines(mapped, Path(self.file_path))
+
+
+class TextDataLoader(DataLoader):
+    """Same interface as DataLoader, but for input that is already in memory
+    (e.g. sent to the daemon). The hash matches that of a file with the same
+    contents, so cached parses and answers are shared between the two.
+    """
+
+    def __init__(self, text: str) -> None:
+        super().__init__(None)
+        self.text = text
+
+    def get_hash(self) -> str:
+        return hashlib.sha256(self.text.encode()).hexdigest()
+
+    def load_data(self) -> List:
+        lines = self.text.splitlines()
+
+        assert len(lines) > 0, "Did not load any data from the given text - check the input"
+        return lines
+
+    def iter_lines(self) -> Iterator[str]:
+        yield from self._iter_stripped(io.StringIO(self.text), "the given text")
+
+    def load_mapped(self) -> MappedLines:
+        assert len(self.text) > 0, "Did not load any data from the given text - check the input"
+        return MappedLines(self.text.encode())
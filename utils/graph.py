@@ -0,0 +1,258 @@
+# A small graph for the days that need one, without the overhead of networkx
+
+from collections import deque
+import heapq
+import math
+from typing import Dict, Hashable, Iterator, List, Optional
+
+
+class Graph:
+    """Directed, weighted graph with nodes interned to ints 0..n-1 and edges
+    held in compressed sparse row form: the edges leaving node u are
+    indices[indptr[u]:indptr[u + 1]], with matching weights. Plain lists are
+    used rather than numpy arrays as every algorithm here walks them in Python.
+
+    Add edges by name (anything hashable), then the algorithms all work on
+    node ids - use node_id/node_name to convert. For an undirected graph, use
+    add_undirected_edge (which adds both directions).
+    """
+
+    def __init__(self) -> None:
+        self.node_ids: Dict[Hashable, int] = {}
+        self.node_names: List[Hashable] = []
+        self.__pending_edges = []
+        self.__built = True
+        self.indptr = [0]
+        self.indices = []
+        self.weights = []
+
+    def __len__(self) -> int:
+        return len(self.node_names)
+
+    def add_node(self, name: Hashable) -> int:
+        node = self.node_ids.get(name)
+        if node is None:
+            node = len(self.node_names)
+            self.node_ids[name] = node
+            self.node_names.append(name)
+            self.__built = False
+        return node
+
+    def node_id(self, name: Hashable) -> int:
+        return self.node_ids[name]
+
+    def node_name(self, node: int) -> Hashable:
+        return self.node_names[node]
+
+    def add_edge(self, src: Hashable, dst: Hashable, weight: int = 1) -> None:
+        self.__pending_edges.append((self.add_node(src), self.add_node(dst), weight))
+        self.__built = False
+
+    def add_undirected_edge(self, node1: Hashable, node2: Hashable, weight: int = 1) -> None:
+        self.add_edge(node1, node2, weight)
+        self.add_edge(node2, node1, weight)
+
+    def __build(self) -> None:
+        """Counting sort the edges into CSR (keeping the order they were
+        added in for each node). Happens on first use after any change.
+        """
+        if self.__built:
+            return
+
+        edges = [
+            (src, self.indices[idx], self.weights[idx])
+            for src in range(len(self.indptr) - 1)
+            for idx in range(self.indptr[src], self.indptr[src + 1])
+        ] + self.__pending_edges
+
+        indptr = [0] * (len(self.node_names) + 1)
+        for src, _, _ in edges:
+            indptr[src + 1] += 1
+        for node in range(len(self.node_names)):
+            indptr[node + 1] += indptr[node]
+
+        next_slot = indptr[:-1]
+        indices = [0] * len(edges)
+        weights = [0] * len(edges)
+        for src, dst, weight in edges:
+            indices[next_slot[src]] = dst
+            weights[next_slot[src]] = weight
+            next_slot[src] += 1
+
+        self.indptr, self.indices, self.weights = indptr, indices, weights
+        self.__pending_edges = []
+        self.__built = True
+
+    def neighbours(self, node: int) -> List[int]:
+        self.__build()
+        return self.indices[self.indptr[node] : self.indptr[node + 1]]
+
+    def edges(self, node: int) -> Iterator[tuple]:
+        """(neighbour, weight) for each edge leaving node"""
+        self.__build()
+        for idx in range(self.indptr[node], self.indptr[node + 1]):
+            yield self.indices[idx], self.weights[idx]
+
+    def bfs(self, source: int) -> List[int]:
+        """Number of edges on the shortest path to each node (-1 if unreachable)"""
+        self.__build()
+        indptr, indices = self.indptr, self.indices
+        dists = [-1] * len(self)
+        dists[source] = 0
+        frontier = deque([source])
+        while len(frontier) > 0:
+            node = frontier.popleft()
+            for idx in range(indptr[node], indptr[node + 1]):
+                neighbour = indices[idx]
+                if dists[neighbour] == -1:
+                    dists[neighbour] = dists[node] + 1
+                    frontier.append(neighbour)
+        return dists
+
+    def dijkstra(self, source: int, target: Optional[int] = None) -> List[float]:
+        """Weighted shortest distance to each node (math.inf if unreachable).
+        Weights must not be negative. Stops early once target is settled.
+        """
+        self.__build()
+        indptr, indices, weights = self.indptr, self.indices, self.weights
+        dists = [math.inf] * len(self)
+        dists[source] = 0
+        frontier = [(0, source)]
+        while len(frontier) > 0:
+            dist, node = heapq.heappop(frontier)
+            if dist > dists[node]:
+                continue  # Already settled through a shorter route
+            if node == target:
+                break
+            for idx in range(indptr[node], indptr[node + 1]):
+                next_dist = dist + weights[idx]
+                if next_dist < dists[indices[idx]]:
+                    dists[indices[idx]] = next_dist
+                    heapq.heappush(frontier, (next_dist, indices[idx]))
+        return dists
+
+    def strongly_connected_components(self) -> List[List[int]]:
+        """Tarjan's algorithm (iterative, so deep graphs do not hit the
+        recursion limit). Components come out in reverse topological order.
+        """
+        self.__build()
+        indptr, indices = self.indptr, self.indices
+        index = [-1] * len(self)
+        low_link = [0] * len(self)
+        on_stack = [False] * len(self)
+        stack = []
+        components = []
+        next_index = 0
+
+        for root in range(len(self)):
+            if index[root] != -1:
+                continue
+            work = [(root, indptr[root])]
+            index[root] = low_link[root] = next_index
+            next_index += 1
+            stack.append(root)
+            on_stack[root] = True
+
+            while len(work) > 0:
+                node, edge_idx = work[-1]
+                if edge_idx < indptr[node + 1]:
+                    work[-1] = (node, edge_idx + 1)
+                    neighbour = indices[edge_idx]
+                    if index[neighbour] == -1:
+                        index[neighbour] = low_link[neighbour] = next_index
+                        next_index += 1
+                        stack.append(neighbour)
+                        on_stack[neighbour] = True
+                        work.append((neighbour, indptr[neighbour]))
+                    elif on_stack[neighbour]:
+                        low_link[node] = min(low_link[node], index[neighbour])
+                    continue
+
+                work.pop()
+                if len(work) > 0:
+                    parent = work[-1][0]
+                    low_link[parent] = min(low_link[parent], low_link[node])
+                if low_link[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+        return components
+
+    def topological_order(self) -> List[int]:
+        """Kahn's algorithm - raises a ValueError if there is a cycle"""
+        self.__build()
+        in_degree = [0] * len(self)
+        for dst in self.indices:
+            in_degree[dst] += 1
+
+        order = [node for node in range(len(self)) if in_degree[node] == 0]
+        for node in order:  # order grows as we go
+            for neighbour in self.neighbours(node):
+                in_degree[neighbour] -= 1
+                if in_degree[neighbour] == 0:
+                    order.append(neighbour)
+
+        if len(order) != len(self):
+            raise ValueError("Graph has a cycle, so there is no topological order")
+        return order
+
+    def simple_paths(self, source: int, target: int) -> Iterator[List[int]]:
+        """Every path from source to target that does not revisit a node (as
+        lists of node ids), found with an iterative DFS
+        """
+        self.__build()
+        indptr, indices = self.indptr, self.indices
+        path = [source]
+        on_path = [False] * len(self)
+        on_path[source] = True
+        work = [indptr[source]]
+
+        while len(work) > 0:
+            node = path[-1]
+            edge_idx = work[-1]
+            if edge_idx == indptr[node + 1]:
+                work.pop()
+                on_path[path.pop()] = False
+                continue
+
+            work[-1] += 1
+            neighbour = indices[edge_idx]
+            if on_path[neighbour]:
+                continue
+            if neighbour == target:
+                yield path + [target]
+                continue
+            path.append(neighbour)
+            on_path[neighbour] = True
+            work.append(indptr[neighbour])
+
+    def longest_simple_path(self, source: int, target: int) -> int:
+        """Largest total weight of any simple path from source to target (-1 if
+        there is none). The same DFS as simple_paths, but only the running
+        total is kept and nodes visited are tracked as bits of an int.
+
+        It still tries every simple path, which is exponential in the number
+        of nodes, so it is only for small graphs - e.g. day 23's maze
+        contracted to its ~36 junctions. The visited int is also as wide as
+        the largest node id, so checks stop being cheap on big graphs.
+        """
+        self.__build()
+        indptr, indices, weights = self.indptr, self.indices, self.weights
+        longest = -1
+        work = [(source, 1 << source, 0)]
+        while len(work) > 0:
+            node, visited, total = work.pop()
+            if node == target:
+                longest = max(longest, total)
+                continue
+            for idx in range(indptr[node], indptr[node + 1]):
+                neighbour = indices[idx]
+                if not visited >> neighbour & 1:
+                    work.append((neighbour, visited | 1 << neighbour, total + weights[idx]))
+        return longest
@@ -1,7 +1,18 @@
 # Using a numpy grid, here are some useful common functions
 
+import functools
 from typing import List, Tuple, Iterable, Dict
 
+from utils.lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+OUT_OF_BOUNDS = -1  # Neighbour table entry for steps that leave the grid
+
+# Same order as get_adjacent_positions, so either gives neighbours in the same order
+ORTHOGONAL_STEPS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+DIAGONAL_STEPS = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+
 
 class GridVisualiser:
     def __init__(self, grid: Iterable, spec: Dict):
@@ -17,6 +28,182 @@ class GridVisualiser:
         print(display_grid)
 
 
+class Grid:
+    """Neighbour lookups for a grid shape, worked out once up front. Cells are
+    referred to by their flat index (row * width + col, the same as indexing
+    grid.ravel()), and row k of neighbour_table holds the flat index of each
+    neighbour of cell k, or OUT_OF_BOUNDS where the step leaves the grid.
+
+    Use Grid.for_shape to share the tables between everything using the same
+    shape, e.g.
+
+        grid_nav = Grid.for_shape(grid.shape)
+        for neighbour in grid_nav.neighbours(grid_nav.to_flat(pos)):
+            if grid.ravel()[neighbour] != ROCK:
+                ...
+    """
+
+    def __init__(self, shape: Tuple[int], include_diagonals: bool = False) -> None:
+        self.shape = tuple(shape)
+        self.height, self.width = self.shape
+        self.size = self.height * self.width
+        self.steps = ORTHOGONAL_STEPS + (DIAGONAL_STEPS if include_diagonals else [])
+
+        rows, cols = np.divmod(np.arange(self.size), self.width)
+        self.neighbour_table = np.full((self.size, len(self.steps)), OUT_OF_BOUNDS)
+        for step_idx, (d_row, d_col) in enumerate(self.steps):
+            next_rows, next_cols = rows + d_row, cols + d_col
+            in_bounds = (next_rows >= 0) & (next_rows < self.height)
+            in_bounds &= (next_cols >= 0) & (next_cols < self.width)
+            next_flat = next_rows * self.width + next_cols
+            self.neighbour_table[in_bounds, step_idx] = next_flat[in_bounds]
+
+        self.__table_rows = None  # Python lists of the table, filled in on first use
+        self.__neighbour_lists = None
+
+    @classmethod
+    @functools.lru_cache(maxsize=32)
+    def for_shape(cls, shape: Tuple[int], include_diagonals: bool = False) -> "Grid":
+        return cls(shape, include_diagonals)
+
+    def to_flat(self, pos: Tuple[int]) -> int:
+        return pos[0] * self.width + pos[1]
+
+    def to_pos(self, flat_pos: int) -> Tuple[int]:
+        return divmod(int(flat_pos), self.width)
+
+    def neighbours(self, flat_pos: int) -> List[int]:
+        """In-bounds neighbours of a single cell, as a plain list of ints since
+        that is quickest to loop over in Python
+        """
+        if self.__table_rows is None:
+            self.__table_rows = self.neighbour_table.tolist()
+            self.__neighbour_lists = [None] * self.size
+
+        neighbours = self.__neighbour_lists[flat_pos]
+        if neighbours is None:
+            neighbours = [x for x in self.__table_rows[flat_pos] if x != OUT_OF_BOUNDS]
+            self.__neighbour_lists[flat_pos] = neighbours
+        return neighbours
+
+    def frontier_neighbours(self, frontier: "np.ndarray") -> "np.ndarray":
+        """Every distinct in-bounds neighbour of every cell in the frontier (an
+        array of flat indices) in one go, for stepping a BFS a layer at a time
+        """
+        reached = np.zeros(self.size + 1, dtype=bool)  # The spare slot soaks up OUT_OF_BOUNDS
+        reached[self.neighbour_table[frontier]] = True
+        return np.flatnonzero(reached[:-1])
+
+
+@functools.lru_cache(maxsize=64)
+def _column_mask(shape: Tuple[int], first_col: int, stop_col: int) -> int:
+    """BitGrid bits set for columns first_col <= col < stop_col of every row"""
+    height, width = shape
+    row_bits = (1 << stop_col) - (1 << first_col)
+    # Multiplying by 0b...0001_0001 (one 1 per row) copies row_bits into every row
+    return row_bits * (((1 << (height * width)) - 1) // ((1 << width) - 1))
+
+
+class BitGrid:
+    """A grid of booleans packed into a single arbitrary-precision int, with
+    cell (row, col) as bit row * width + col. Moving everything a row is then
+    just one shift, so whole-grid steps (and, or, shifts and popcounts) run a
+    machine word at a time rather than a Python loop per cell. BitGrids are
+    immutable and hashable, so they also make good states to remember.
+    """
+
+    def __init__(self, bits: int, shape: Tuple[int]) -> None:
+        self.bits = bits
+        self.shape = tuple(shape)
+        self.height, self.width = self.shape
+
+    @classmethod
+    def from_mask(cls, mask: "np.ndarray") -> "BitGrid":
+        packed = np.packbits(np.asarray(mask, dtype=bool).ravel(), bitorder="little")
+        return cls(int.from_bytes(packed.tobytes(), "little"), mask.shape)
+
+    def to_mask(self) -> "np.ndarray":
+        size = self.height * self.width
+        packed = np.frombuffer(self.bits.to_bytes((size + 7) // 8, "little"), dtype=np.uint8)
+        unpacked = np.unpackbits(packed, count=size, bitorder="little")
+        return unpacked.reshape(self.shape).astype(bool)
+
+    def __repr__(self) -> str:
+        return f"BitGrid(shape={self.shape}, count={self.count()})"
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, BitGrid) and (self.bits, self.shape) == (other.bits, other.shape)
+
+    def __hash__(self) -> int:
+        return hash((self.bits, self.shape))
+
+    def __bool__(self) -> bool:
+        return self.bits != 0
+
+    def __and__(self, other: "BitGrid") -> "BitGrid":
+        return BitGrid(self.bits & other.bits, self.shape)
+
+    def __or__(self, other: "BitGrid") -> "BitGrid":
+        return BitGrid(self.bits | other.bits, self.shape)
+
+    def __xor__(self, other: "BitGrid") -> "BitGrid":
+        return BitGrid(self.bits ^ other.bits, self.shape)
+
+    def __invert__(self) -> "BitGrid":
+        return BitGrid(self.bits ^ _column_mask(self.shape, 0, self.width), self.shape)
+
+    def count(self) -> int:
+        """Popcount - how many cells are set"""
+        return self.bits.bit_count()
+
+    def rows(self) -> List[int]:
+        """Each row as an int, with bit col set for each cell set in the row"""
+        row_mask = (1 << self.width) - 1
+        return [(self.bits >> (row * self.width)) & row_mask for row in range(self.height)]
+
+    def cols(self) -> List[int]:
+        """Each column as an int, with bit row set for each cell set in it"""
+        return self.transpose().rows()
+
+    def shift(self, d_row: int, d_col: int) -> "BitGrid":
+        """Move every cell by (d_row, d_col) - whatever goes off the edge is lost"""
+        bits = self.bits
+        if d_col > 0:
+            bits &= _column_mask(self.shape, 0, max(self.width - d_col, 0))
+        elif d_col < 0:
+            bits &= _column_mask(self.shape, min(-d_col, self.width), self.width)
+
+        offset = d_row * self.width + d_col
+        bits = bits << offset if offset >= 0 else bits >> -offset
+        return BitGrid(bits & _column_mask(self.shape, 0, self.width), self.shape)
+
+    def neighbours(self) -> "BitGrid":
+        """Every cell orthogonally next to a set cell (the set cells themselves
+        are only included if they neighbour another)
+        """
+        spread = 0
+        for d_row, d_col in ORTHOGONAL_STEPS:
+            spread |= self.shift(d_row, d_col).bits
+        return BitGrid(spread, self.shape)
+
+    def transpose(self) -> "BitGrid":
+        return BitGrid.from_mask(self.to_mask().T)
+
+    def rotate(self, k: int = 1) -> "BitGrid":
+        """Rotate 90 degrees anticlockwise k times, the same as np.rot90"""
+        return BitGrid.from_mask(np.rot90(self.to_mask(), k))
+
+
+def clear_grid_caches() -> None:
+    """Drop the tables kept by Grid.for_shape and the BitGrid column masks.
+    Solver calls this at the end of every part (like the memoize caches), so
+    they only last as long as the part that made them, rather than piling up
+    in a long-running daemon or batch.
+    """
+    Grid.for_shape.cache_clear()
+    _column_mask.cache_clear()
+
+
 def get_adjacent_positions(
     pos: Tuple[int],
     arr_shape: Tuple[int],
@@ -66,3 +253,67 @@ def get_adjacent_positions(
 
 def get_manhattan_dist(point1: Tuple[int], point2: Tuple[int]) -> int:
     return sum([abs(p1 - p2) for p1, p2 in zip(point1, point2)])
+
+
+def _fill_flat(
+    grid_nav: Grid, passable_flat: "np.ndarray", filled: "np.ndarray", frontier: "np.ndarray"
+) -> List["np.ndarray"]:
+    """Breadth first fill over flat indices, a whole layer at a time. Both
+    passable_flat and filled have a spare last slot that OUT_OF_BOUNDS (-1)
+    indexes, which must be False in passable_flat so it is never entered.
+    Marks everything reached in filled, and returns the layers.
+    """
+    filled[frontier] = True
+    layers = [frontier]
+    while len(frontier) > 0:
+        candidates = grid_nav.neighbour_table[frontier].ravel()
+        candidates = candidates[passable_flat[candidates] & ~filled[candidates]]
+        frontier = np.unique(candidates)
+        filled[frontier] = True
+        layers.append(frontier)
+    return layers
+
+
+def flood_fill(
+    passable: "np.ndarray", seeds: Iterable, include_diagonals: bool = False
+) -> "np.ndarray":
+    """Boolean mask of every passable cell connected to a seed (through other
+    passable cells). Seeds can be a boolean mask the same shape as passable or
+    a list of (row, col) positions - seeds that are not passable are ignored.
+    """
+    grid_nav = Grid.for_shape(passable.shape, include_diagonals)
+    passable_flat = np.append(passable.ravel(), False)
+
+    if isinstance(seeds, np.ndarray) and seeds.dtype == bool:
+        frontier = np.flatnonzero(seeds.ravel())
+    else:
+        frontier = np.array([grid_nav.to_flat(x) for x in seeds], dtype=int)
+    frontier = np.unique(frontier[passable_flat[frontier]])
+
+    filled = np.zeros(grid_nav.size + 1, dtype=bool)
+    _fill_flat(grid_nav, passable_flat, filled, frontier)
+    return filled[:-1].reshape(passable.shape)
+
+
+def label_regions(
+    mask: "np.ndarray", include_diagonals: bool = False
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Connected regions of a boolean mask. Returns a grid labelling each
+    region 1, 2, ... (0 for cells outside the mask) and the size of each
+    region, indexed by label (so sizes[0] is always 0). The mask for a
+    single region is then just labels == label.
+    """
+    grid_nav = Grid.for_shape(mask.shape, include_diagonals)
+    passable_flat = np.append(mask.ravel(), False)
+    filled = np.zeros(grid_nav.size + 1, dtype=bool)
+
+    labels = np.zeros(grid_nav.size, dtype=np.int32)
+    sizes = [0]
+    for start in np.flatnonzero(mask.ravel()).tolist():
+        if filled[start]:
+            continue
+        region = np.concatenate(_fill_flat(grid_nav, passable_flat, filled, np.array([start])))
+        labels[region] = len(sizes)
+        sizes.append(len(region))
+
+    return labels.reshape(mask.shape), np.array(sizes)
@@ -0,0 +1,158 @@
+# Arithmetic on whole ranges of integers, for days that map ranges rather than values
+
+import math
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+Interval = Tuple[int, int]  # [start, stop) like range(), so stop is NOT included
+
+
+class IntervalSet:
+    """A set of integers held as sorted, disjoint, non-touching [start, stop)
+    intervals. Every operation returns a new set, and is linear in the number
+    of intervals (never the number of integers) so huge ranges cost nothing.
+    """
+
+    def __init__(self, intervals: Iterable[Interval] = ()) -> None:
+        self.intervals: List[Interval] = []
+        for start, stop in sorted(intervals):
+            if start >= stop:
+                continue
+            if len(self.intervals) > 0 and start <= self.intervals[-1][1]:
+                prev_start, prev_stop = self.intervals[-1]
+                self.intervals[-1] = (prev_start, max(prev_stop, stop))
+            else:
+                self.intervals.append((start, stop))
+
+    @classmethod
+    def from_range(cls, start: int, length: int) -> "IntervalSet":
+        """From the (start, length) pairs AoC likes to use"""
+        return cls([(start, start + length)])
+
+    def __iter__(self) -> Iterator[Interval]:
+        return iter(self.intervals)
+
+    def __bool__(self) -> bool:
+        return len(self.intervals) > 0
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, IntervalSet) and self.intervals == other.intervals
+
+    def __repr__(self) -> str:
+        return f"IntervalSet({self.intervals})"
+
+    def __contains__(self, value: int) -> bool:
+        return any(start <= value < stop for start, stop in self.intervals)
+
+    @property
+    def size(self) -> int:
+        """How many integers are in the set"""
+        return sum(stop - start for start, stop in self.intervals)
+
+    def min(self) -> int:
+        return self.intervals[0][0]
+
+    def max(self) -> int:
+        return self.intervals[-1][1] - 1
+
+    def union(self, other: "IntervalSet") -> "IntervalSet":
+        return IntervalSet(self.intervals + other.intervals)
+
+    def intersection(self, other: "IntervalSet") -> "IntervalSet":
+        """Walk both sorted lists together, keeping the overlap of each pair"""
+        overlaps = []
+        idx, other_idx = 0, 0
+        while idx < len(self.intervals) and other_idx < len(other.intervals):
+            start, stop = self.intervals[idx]
+            other_start, other_stop = other.intervals[other_idx]
+            if max(start, other_start) < min(stop, other_stop):
+                overlaps.append((max(start, other_start), min(stop, other_stop)))
+            if stop < other_stop:
+                idx += 1
+            else:
+                other_idx += 1
+        return IntervalSet(overlaps)
+
+    def difference(self, other: "IntervalSet") -> "IntervalSet":
+        remaining = []
+        other_idx = 0
+        for start, stop in self.intervals:
+            # Skip anything in other that ends before this interval starts
+            while other_idx < len(other.intervals) and other.intervals[other_idx][1] <= start:
+                other_idx += 1
+
+            cut_idx = other_idx
+            while cut_idx < len(other.intervals) and other.intervals[cut_idx][0] < stop:
+                cut_start, cut_stop = other.intervals[cut_idx]
+                if cut_start > start:
+                    remaining.append((start, cut_start))
+                start = max(start, cut_stop)
+                cut_idx += 1
+            if start < stop:
+                remaining.append((start, stop))
+        return IntervalSet(remaining)
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+    def shift(self, offset: int) -> "IntervalSet":
+        return IntervalSet([(start + offset, stop + offset) for start, stop in self.intervals])
+
+    def split(self, at: int) -> Tuple["IntervalSet", "IntervalSet"]:
+        """(everything below at, everything from at upwards)"""
+        below, above = [], []
+        for start, stop in self.intervals:
+            if start < at:
+                below.append((start, min(stop, at)))
+            if stop > at:
+                above.append((max(start, at), stop))
+        return IntervalSet(below), IntervalSet(above)
+
+
+class Box:
+    """A hyper-rectangle of integers, one [start, stop) interval per axis"""
+
+    def __init__(self, axes: Iterable[Interval]) -> None:
+        self.axes: Tuple[Interval, ...] = tuple(axes)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Box) and self.axes == other.axes
+
+    def __hash__(self) -> int:
+        return hash(self.axes)
+
+    def __repr__(self) -> str:
+        return f"Box({list(self.axes)})"
+
+    @property
+    def volume(self) -> int:
+        return math.prod(max(stop - start, 0) for start, stop in self.axes)
+
+    def is_empty(self) -> bool:
+        return any(start >= stop for start, stop in self.axes)
+
+    def __with_axis(self, axis: int, start: int, stop: int) -> Optional["Box"]:
+        if start >= stop:
+            return None
+        return Box(self.axes[:axis] + ((start, stop),) + self.axes[axis + 1 :])
+
+    def split(self, axis: int, at: int) -> Tuple[Optional["Box"], Optional["Box"]]:
+        """(the part below at on this axis, the part from at upwards), with
+        None for either side that would be empty
+        """
+        start, stop = self.axes[axis]
+        return (
+            self.__with_axis(axis, start, min(stop, at)),
+            self.__with_axis(axis, max(start, at), stop),
+        )
+
+    def intersection(self, other: "Box") -> Optional["Box"]:
+        axes = [
+            (max(start, other_start), min(stop, other_stop))
+            for (start, stop), (other_start, other_stop) in zip(self.axes, other.axes)
+        ]
+        overlap = Box(axes)
+        return None if overlap.is_empty() else overlap
+
+    def shift(self, offsets: Iterable[int]) -> "Box":
+        return Box((start + x, stop + x) for (start, stop), x in zip(self.axes, offsets))
@@ -0,0 +1,27 @@
+# Defer importing heavy packages until they are first used
+
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Use in place of `import name` for heavy packages that only some parts
+    need, e.g. `nx = lazy_import("networkx")`. The module is only executed on
+    the first attribute access, so importing a day (or skipping it because the
+    answer is cached) does not pay for it. A missing package still raises an
+    ImportError straight away.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named {name!r}", name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
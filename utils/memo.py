@@ -0,0 +1,104 @@
+# Memoisation for recursive solver methods, scoped to a single run and with stats
+
+from collections import OrderedDict
+import functools
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def _freeze(value: Any) -> Hashable:
+    """Turn the usual unhashable arguments (lists, sets, dicts) into hashable
+    equivalents, recursively
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(x) for x in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(x) for x in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+class MemoCache:
+    """The results for one memoised method, with optional LRU eviction"""
+
+    def __init__(self, maxsize: Optional[int] = None) -> None:
+        self.maxsize = maxsize
+        self.entries = OrderedDict() if maxsize is not None else {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def store(self, key: Hashable, value: Any) -> None:
+        self.entries[key] = value
+        if self.maxsize is not None and len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)  # Least recently used
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.entries),
+            "evictions": self.evictions,
+        }
+
+
+def memoize(
+    maxsize: Optional[int] = None, key: Optional[Callable[..., Hashable]] = None
+) -> Callable:
+    """Memoise a method, e.g.
+
+        @memoize(maxsize=100000)
+        def __count(self, sequence: str, spec: Tuple[int]) -> int:
+
+    Unlike functools.cache, the results are held on the instance (so self is
+    not kept alive by the cache, and is not part of the key) in
+    self._memo_caches, which Solver empties at the start and end of every part
+    - so nothing leaks between parts or inputs, and the hit/miss/size stats
+    end up in the part's result.
+
+    Args:
+        maxsize (Optional[int]): evict the least recently used result past this
+            many (unbounded if None)
+        key (Optional[Callable]): builds the cache key from the arguments, to
+            normalise equivalent ones to the same key. By default the arguments
+            themselves are the key, with lists/sets/dicts made hashable.
+    """
+
+    def decorator(method: Callable) -> Callable:
+        name = method.__qualname__
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs) -> Any:
+            memo_caches = self.__dict__.setdefault("_memo_caches", {})
+            memo = memo_caches.get(name)
+            if memo is None:
+                memo = memo_caches[name] = MemoCache(maxsize)
+
+            if key is not None:
+                cache_key = key(*args, **kwargs)
+            elif kwargs:
+                cache_key = args + (None,) + tuple(sorted(kwargs.items()))
+            else:
+                cache_key = args
+
+            try:
+                found = cache_key in memo.entries
+            except TypeError:  # Unhashable arguments
+                cache_key = _freeze(cache_key)
+                found = cache_key in memo.entries
+
+            if found:
+                memo.hits += 1
+                if maxsize is not None:
+                    memo.entries.move_to_end(cache_key)
+                return memo.entries[cache_key]
+
+            memo.misses += 1
+            result = method(self, *args, **kwargs)
+            memo.store(cache_key, result)
+            return result
+
+        return wrapper
+
+    return decorator
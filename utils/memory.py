@@ -0,0 +1,41 @@
+# Peak memory helpers for reporting how much each part needs
+
+from pathlib import Path
+import sys
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_PROC_STATUS = Path("/proc/self/status")
+_PROC_CLEAR_REFS = Path("/proc/self/clear_refs")
+
+
+def reset_peak_rss() -> bool:
+    """Reset the RSS high water mark so the next reading only covers what runs
+    in between. This is only possible on Linux - elsewhere the peak is for the
+    lifetime of the process, which is reported by get_peak_rss_kib regardless.
+
+    Returns:
+        bool: whether the peak was actually reset
+    """
+    try:
+        _PROC_CLEAR_REFS.write_text("5")
+    except OSError:
+        return False
+    return True
+
+
+def get_peak_rss_kib() -> int:
+    """Peak resident set size of this process in KiB (or -1 if unavailable)"""
+    if _PROC_STATUS.exists():
+        for line in _PROC_STATUS.read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1])
+
+    if resource is None:
+        return -1
+    # ru_maxrss is KiB on Linux but bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss // 1024 if sys.platform == "darwin" else max_rss
@@ -1,10 +1,13 @@
-from typing import List
+from typing import Iterable, Iterator, List, Optional
 
-import numpy as np
+from utils.data_loader import CR, MappedLines
+from utils.lazy_import import lazy_import
+
+np = lazy_import("numpy")  # Only needed once a grid is actually parsed
 
 
 class BaseParser:
-    def __init__(self, data: List[str]) -> None:
+    def __init__(self, data: Iterable[str]) -> None:
         self.data = data
 
     def parse(self) -> None:
@@ -12,24 +15,50 @@ class BaseParser:
 
 
 class NewLineListParser(BaseParser):
-    def parse(self) -> np.array:
-        all_groups = []
+    def parse(self) -> List[List[str]]:
+        return list(self.iter_groups())
+
+    def iter_groups(self) -> Iterator[List[str]]:
+        """Yield each group as soon as its blank line is reached, so streamed
+        input only ever holds one group at a time
+        """
         curr_group = []
 
         for line in self.data:
             if line.strip() == "":
-                all_groups.append(curr_group)
+                yield curr_group
                 curr_group = []
                 continue
             curr_group.append(line)
 
         if len(curr_group) > 0:
-            all_groups.append(curr_group)  # Catches the last one parsed if does not end in newline
-        return all_groups
+            yield curr_group  # Catches the last one parsed if does not end in newline
+
+
+def _check_row_widths(widths: Iterable[int]) -> None:
+    """Grids have to be rectangular - say which row is not, rather than
+    leaving numpy to fail to reshape
+    """
+    widths = np.asarray(widths)
+    if len(widths) == 0:
+        raise ValueError("Grid is empty")
+    if widths[0] == 0:
+        raise ValueError("Grid row 0 is blank")
+    bad_rows = np.flatnonzero(widths != widths[0])
+    if len(bad_rows) > 0:
+        row = int(bad_rows[0])
+        raise ValueError(
+            f"Grid row {row} is {widths[row]} wide, but row 0 is {widths[0]} - rows must match"
+        )
 
 
 class NumpyArrayParser(BaseParser):
-    def parse(self) -> np.array:
+    """parse() gives a grid of single character strings. For anything big,
+    parse_codes()/parse_digits() are much faster and use a quarter of the
+    memory - they build a uint8 grid straight from the bytes instead.
+    """
+
+    def parse(self) -> "np.ndarray":
         all_lines = []
         for line in self.data:
             new_line = []
@@ -37,3 +66,64 @@ class NumpyArrayParser(BaseParser):
                 new_line.append(each_char)
             all_lines.append(new_line)
         return np.array(all_lines)
+
+    def __to_byte_grid(self) -> "np.ndarray":
+        if isinstance(self.data, MappedLines):
+            source = self.data.source
+            end = len(self.data.buffer)
+            while end > 0 and source[end - 1] in b"\r\n":
+                end -= 1  # Blank lines at the end of the file are not rows
+            raw = np.frombuffer(self.data.buffer[:end], dtype=np.uint8)
+            newline = source.find(b"\n", 0, end)
+            if newline == -1:
+                _check_row_widths([end])
+                return raw.reshape(1, -1).copy()
+
+            crlf = newline > 0 and source[newline - 1] == CR
+            newlines = np.flatnonzero(raw == ord("\n"))
+            if crlf and (raw[newlines - 1] != CR).any():
+                row = int(np.flatnonzero(raw[newlines - 1] != CR)[0])
+                raise ValueError(f"Grid row {row} ends in \\n, but row 0 ends in \\r\\n")
+            # Each row ends at its newline (or \r\n), apart from the last which ends at end
+            widths = np.diff(newlines, prepend=-1) - 1 - crlf
+            _check_row_widths(np.append(widths, end - newlines[-1] - 1))
+
+            # Every row is the same width, so step over the newlines rather than
+            # copying them too (then copy, as the mapped file is read-only)
+            stride = newline + 1
+            shape = (len(newlines) + 1, newline - crlf)
+            return np.lib.stride_tricks.as_strided(raw, shape, (stride, 1)).copy()
+
+        lines = self.data if isinstance(self.data, list) else list(self.data)
+        num_rows = len(lines)
+        while num_rows > 0 and lines[num_rows - 1] == "":
+            num_rows -= 1  # Blank lines at the end of the input are not rows
+        lines = lines[:num_rows]
+        _check_row_widths([len(line) for line in lines])
+        raw = np.frombuffer("".join(lines).encode("ascii"), dtype=np.uint8)
+        return raw.reshape(len(lines), -1).copy()
+
+    def parse_codes(self, symbols: Optional[str] = None) -> "np.ndarray":
+        """uint8 grid of the ASCII code of each character, so compare against
+        e.g. ord("#"). With symbols, each character is instead replaced by its
+        index in symbols (e.g. symbols=".#" gives 0 for "." and 1 for "#"),
+        and any character not in symbols raises a ValueError.
+        """
+        grid = self.__to_byte_grid()
+        if symbols is None:
+            return grid
+
+        symbol_codes = np.frombuffer(symbols.encode("ascii"), dtype=np.uint8)
+        lookup = np.full(256, 255, dtype=np.uint8)
+        lookup[symbol_codes] = np.arange(len(symbol_codes), dtype=np.uint8)
+        grid = lookup[grid]
+        if (grid == 255).any():
+            raise ValueError(f"Grid contains characters other than {symbols!r}")
+        return grid
+
+    def parse_digits(self) -> "np.ndarray":
+        """uint8 grid of single digit numbers, e.g. for path costs"""
+        grid = self.__to_byte_grid() - ord("0")
+        if (grid > 9).any():
+            raise ValueError("Grid contains characters that are not digits")
+        return grid
@@ -0,0 +1,112 @@
+# Shortest paths across a grid of step costs, with rules on how moves can chain together
+
+import heapq
+import math
+from typing import Tuple
+
+from utils.grid_utils import Grid, OUT_OF_BOUNDS
+from utils.lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+_REVERSE_STEP = [1, 0, 3, 2]  # Index of the opposite direction in ORTHOGONAL_STEPS
+
+
+class MoveRules:
+    """Which moves are allowed, given the current run (steps taken in a
+    straight line so far). This is plain 4-way movement - subclass it and
+    override the can_* methods to add constraints. Runs are tracked up to
+    max_run (0 if the rules do not care about them) and the methods are only
+    called once per run length to build lookup tables, so they can be slow.
+    Turning straight back on yourself is never allowed.
+    """
+
+    max_run = 0
+
+    def can_go_straight(self, run: int) -> bool:
+        return True
+
+    def can_turn(self, run: int) -> bool:
+        return True
+
+    def can_stop(self, run: int) -> bool:
+        """Whether the path can end at the goal after this run"""
+        return True
+
+
+def grid_shortest_path(
+    costs: "np.ndarray",
+    start: Tuple[int],
+    goal: Tuple[int],
+    rules: MoveRules = MoveRules(),
+    min_step_cost: int = 0,
+) -> int:
+    """Cheapest way from start to goal, where stepping into a cell costs its
+    value in costs (the start cell itself is free).
+
+    Each state (cell, direction entered from, run) is packed into a single int,
+    and so is each heap entry (priority * number of states + state), so the
+    search is just ints and lists. With min_step_cost > 0 it becomes A*, using
+    the Manhattan distance to the goal times min_step_cost as the heuristic -
+    this must not be more than the cost of any cell or the answer may be wrong.
+
+    Raises:
+        ValueError: if the goal cannot be reached
+    """
+    grid_nav = Grid.for_shape(costs.shape)
+    neighbour_rows = grid_nav.neighbour_table.tolist()
+    cell_costs = costs.ravel().tolist()
+
+    run_states = rules.max_run + 1
+    straight_ok = [rules.can_go_straight(run) for run in range(run_states)]
+    turn_ok = [rules.can_turn(run) for run in range(run_states)]
+    stop_ok = [rules.can_stop(run) for run in range(run_states)]
+    straight_run = [min(run + 1, rules.max_run) for run in range(run_states)]
+    turn_run = min(1, rules.max_run)
+
+    rows, cols = np.divmod(np.arange(grid_nav.size), grid_nav.width)
+    heuristic = (min_step_cost * (abs(rows - goal[0]) + abs(cols - goal[1]))).tolist()
+
+    num_states = grid_nav.size * 4 * run_states
+    best_costs = [math.inf] * num_states
+    goal_flat = grid_nav.to_flat(goal)
+
+    frontier = []
+    for direction, neighbour in enumerate(neighbour_rows[grid_nav.to_flat(start)]):
+        if neighbour != OUT_OF_BOUNDS:
+            state = (neighbour * 4 + direction) * run_states + turn_run
+            best_costs[state] = cell_costs[neighbour]
+            priority = cell_costs[neighbour] + heuristic[neighbour]
+            heapq.heappush(frontier, priority * num_states + state)
+
+    while len(frontier) > 0:
+        priority, state = divmod(heapq.heappop(frontier), num_states)
+        flat_dir, run = divmod(state, run_states)
+        flat_pos, direction = divmod(flat_dir, 4)
+        cost = priority - heuristic[flat_pos]
+        if cost > best_costs[state]:
+            continue  # Already reached this state more cheaply
+
+        if flat_pos == goal_flat and stop_ok[run]:
+            return cost
+
+        for next_direction, neighbour in enumerate(neighbour_rows[flat_pos]):
+            if neighbour == OUT_OF_BOUNDS or next_direction == _REVERSE_STEP[direction]:
+                continue
+            if next_direction == direction:
+                if not straight_ok[run]:
+                    continue
+                next_run = straight_run[run]
+            else:
+                if not turn_ok[run]:
+                    continue
+                next_run = turn_run
+
+            next_state = (neighbour * 4 + next_direction) * run_states + next_run
+            next_cost = cost + cell_costs[neighbour]
+            if next_cost < best_costs[next_state]:
+                best_costs[next_state] = next_cost
+                next_priority = next_cost + heuristic[neighbour]
+                heapq.heappush(frontier, next_priority * num_states + next_state)
+
+    raise ValueError(f"No path from {start} to {goal}")
@@ -0,0 +1,103 @@
+# Hand a numpy grid to worker processes through shared memory rather than pickling it
+
+from contextlib import contextmanager
+import threading
+from typing import Dict, Iterator, Optional, Tuple
+
+from utils.lazy_import import lazy_import
+
+np = lazy_import("numpy")
+shared_memory = lazy_import("multiprocessing.shared_memory")
+
+_ATTACHED: Dict[str, "shared_memory.SharedMemory"] = {}  # Kept open for the life of the process
+
+
+class SharedGrid:
+    """Handle on a grid in shared memory. Pickling it only sends (name, shape,
+    dtype), so it costs the same however big the grid is, and each process
+    maps the same memory the first time it asks for the array. The array is
+    read only, as every process sees the same memory.
+
+    Handles from share_grid only put the grid in shared memory the first time
+    they are pickled, so nothing is shared if the work never leaves this
+    process (e.g. map_items running serially).
+    """
+
+    def __init__(self, name: Optional[str], shape: Tuple[int], dtype: str) -> None:
+        self.name = name
+        self.shape = tuple(shape)
+        self.dtype = str(dtype)
+        self._array = None
+        self._memory = None  # Only set in the process that created the shared memory
+        self._share_lock = threading.Lock()  # Pickling can happen on a pool's feeder thread
+        self._closed = False
+
+    def __getstate__(self) -> Dict:
+        with self._share_lock:
+            if self._closed:
+                raise ValueError(f"{self!r} cannot be sent once its share_grid block has ended")
+            if self.name is None:
+                self.__share()
+        return {"name": self.name, "shape": self.shape, "dtype": self.dtype}
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self._array = None
+        self._memory = None
+        self._share_lock = threading.Lock()
+        self._closed = False
+
+    def __repr__(self) -> str:
+        return f"SharedGrid({self.name!r}, shape={self.shape}, dtype={self.dtype})"
+
+    def __share(self) -> None:
+        size = max(self._array.nbytes, 1)
+        self._memory = shared_memory.SharedMemory(create=True, size=size)
+        np.ndarray(self.shape, self.dtype, buffer=self._memory.buf)[...] = self._array
+        self.name = self._memory.name
+
+    @property
+    def array(self) -> "np.ndarray":
+        if self._array is None:
+            if self.name not in _ATTACHED:
+                _ATTACHED[self.name] = _attach(self.name)
+            self._array = np.ndarray(self.shape, self.dtype, buffer=_ATTACHED[self.name].buf)
+            self._array.flags.writeable = False
+        return self._array
+
+
+def _attach(name: str) -> "shared_memory.SharedMemory":
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        # Older versions register it with the resource tracker again, which is
+        # shared with the parent (that unlinks it), so this is harmless
+        return shared_memory.SharedMemory(name=name)
+
+
+@contextmanager
+def share_grid(grid: "np.ndarray") -> Iterator[SharedGrid]:
+    """Share a grid with worker processes for as long as the block runs, e.g.
+
+        with share_grid(grid) as shared:
+            return self.map_items(self.__score, [(shared, x) for x in starts])
+
+    with shared.array giving the grid back in whichever process uses it. The
+    grid is only copied into shared memory once the handle is first sent to
+    another process. This process reads the grid it already has rather than
+    the shared copy, and workers keep their mapping for as long as they run,
+    so no array from shared.array ever points at memory that has been freed.
+    Any shared memory is freed when the block ends.
+    """
+    shared = SharedGrid(None, grid.shape, grid.dtype)
+    shared._array = grid.view()
+    shared._array.flags.writeable = False
+    try:
+        yield shared
+    finally:
+        with shared._share_lock:
+            shared._closed = True
+            if shared._memory is not None:
+                shared._memory.close()
+                shared._memory.unlink()
+                shared._memory = None